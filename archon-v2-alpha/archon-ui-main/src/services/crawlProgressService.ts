@@ -201,29 +201,37 @@ class CrawlProgressService {
       });
 
       // Add stop event handlers
+      const handleStopping = (data: any) => {
+        onMessage({
+          progressId,
+          status: 'stopping',
+          percentage: data.percentage || 0,
+          log: data.message
+        });
+      };
+
+      const handleStopped = (data: any) => {
+        onMessage({
+          progressId,
+          status: 'cancelled',
+          percentage: 100,
+          completed: true,
+          log: data.message
+        });
+        
+        // Auto-cleanup after stop
+        setTimeout(() => this.stopStreaming(progressId), 1000);
+      };
+
       this.wsService.addMessageHandler('crawl:stopping', (message) => {
         if (message.data?.progressId === progressId) {
-          onMessage({
-            progressId,
-            status: 'stopping',
-            percentage: message.data.percentage || 0,
-            log: message.data.message
-          });
+          handleStopping(message.data);
         }
       });
       
       this.wsService.addMessageHandler('crawl:stopped', (message) => {
         if (message.data?.progressId === progressId) {
-          onMessage({
-            progressId,
-            status: 'cancelled',
-            percentage: 100,
-            completed: true,
-            log: message.data.message
-          });
-          
-          // Auto-cleanup after stop
-          setTimeout(() => this.stopStreaming(progressId), 1000);
+          handleStopped(message.data);
         }
       });
 
@@ -13,6 +13,7 @@ import asyncio
 import json
 import uuid
 import time
+import types
 from datetime import datetime
 from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
@@ -31,7 +32,11 @@ from .socketio_handlers import (
     start_crawl_progress,
     update_crawl_progress,
     complete_crawl_progress,
-    error_crawl_progress
+    error_crawl_progress,
+    emit_crawl_stopped,
+    iso_now,
+    room_has_members,
+    wait_for_crawl_subscriber
 )
 from ..socketio_app import get_socketio_instance
 
@@ -49,6 +54,12 @@ crawl_semaphore = asyncio.Semaphore(CONCURRENT_CRAWL_LIMIT)
 # Track active async crawl tasks for cancellation support
 active_crawl_tasks: Dict[str, asyncio.Task] = {}
 
+# Fixed part of the stop_crawl_task response; only progressId varies per call
+_STOP_OK_TEMPLATE = types.MappingProxyType({
+    'success': True,
+    'message': 'Crawl task stopped successfully'
+})
+
 # Request Models
 class KnowledgeItemRequest(BaseModel):
     url: str
@@ -82,6 +93,9 @@ class RagQueryRequest(BaseModel):
     source: Optional[str] = None
     match_count: int = 5
 
+class StopCrawlsRequest(BaseModel):
+    progress_ids: List[str]
+
 
 
 @router.get("/test-socket-progress/{progress_id}")
@@ -304,17 +318,16 @@ async def refresh_knowledge_item(source_id: str):
         # Create a wrapped task that acquires the semaphore
         async def _perform_refresh_with_semaphore():
             try:
-                # Add a small delay to allow frontend WebSocket subscription to be established
+                # Wait (up to 1s) for the frontend WebSocket subscription to be established
                 # This prevents the "Room has 0 subscribers" issue
-                await asyncio.sleep(1.0)
+                await wait_for_crawl_subscriber(progress_id)
                 
                 async with crawl_semaphore:
                     safe_logfire_info(f"Acquired crawl semaphore for refresh | source_id={source_id}")
                     await crawl_service.orchestrate_crawl(request_dict)
             finally:
                 # Clean up task from registry when done (success or failure)
-                if progress_id in active_crawl_tasks:
-                    del active_crawl_tasks[progress_id]
+                if active_crawl_tasks.pop(progress_id, None) is not None:
                     safe_logfire_info(f"Cleaned up refresh task from registry | progress_id={progress_id}")
         
         task = asyncio.create_task(_perform_refresh_with_semaphore())
@@ -376,9 +389,9 @@ async def crawl_knowledge_item(request: KnowledgeItemRequest):
 
 async def _perform_crawl_with_progress(progress_id: str, request: KnowledgeItemRequest):
     """Perform the actual crawl operation with progress tracking using service layer."""
-    # Add a small delay to allow frontend WebSocket subscription to be established
+    # Wait (up to 1s) for the frontend WebSocket subscription to be established
     # This prevents the "Room has 0 subscribers" issue
-    await asyncio.sleep(1.0)
+    await wait_for_crawl_subscriber(progress_id)
     
     # Acquire semaphore to limit concurrent crawls
     async with crawl_semaphore:
@@ -445,8 +458,7 @@ async def _perform_crawl_with_progress(progress_id: str, request: KnowledgeItemR
             await error_crawl_progress(progress_id, error_message)
         finally:
             # Clean up task from registry when done (success or failure)
-            if progress_id in active_crawl_tasks:
-                del active_crawl_tasks[progress_id]
+            if active_crawl_tasks.pop(progress_id, None) is not None:
                 safe_logfire_info(f"Cleaned up crawl task from registry | progress_id={progress_id}")
 
 @router.post("/documents/upload")
@@ -501,9 +513,9 @@ async def upload_document(
 
 async def _perform_upload_with_progress(progress_id: str, file_content: bytes, file_metadata: dict, tag_list: List[str], knowledge_type: str):
     """Perform document upload with progress tracking using service layer."""
-    # Add a small delay to allow frontend WebSocket subscription to be established
+    # Wait (up to 1s) for the frontend WebSocket subscription to be established
     # This prevents the "Room has 0 subscribers" issue
-    await asyncio.sleep(1.0)
+    await wait_for_crawl_subscriber(progress_id)
     
     # Create cancellation check function for document uploads
     def check_upload_cancellation():
@@ -604,8 +616,7 @@ async def _perform_upload_with_progress(progress_id: str, file_content: bytes, f
         await error_crawl_progress(progress_id, error_msg)
     finally:
         # Clean up task from registry when done (success or failure)
-        if progress_id in active_crawl_tasks:
-            del active_crawl_tasks[progress_id]
+        if active_crawl_tasks.pop(progress_id, None) is not None:
             safe_logfire_info(f"Cleaned up upload task from registry | progress_id={progress_id}")
 
 @router.post("/knowledge-items/search")
@@ -783,54 +794,61 @@ async def get_crawl_task_status(task_id: str):
         safe_logfire_error(f"Failed to get task status | error={str(e)} | task_id={task_id}")
         raise HTTPException(status_code=500, detail={'error': str(e)})
 
+async def _cancel_active_crawl_task(progress_id: str):
+    """Cancel the orchestration and asyncio task for a crawl, waiting briefly for the task to unwind."""
+    from ..services.knowledge.crawl_orchestration_service import get_active_orchestration, unregister_orchestration
+    
+    # Cancel the orchestration service
+    orchestration = get_active_orchestration(progress_id)
+    if orchestration:
+        orchestration.cancel()
+    
+    # Clear both registries before the first await so they can't be left stale
+    unregister_orchestration(progress_id)
+    task = active_crawl_tasks.pop(progress_id, None)
+    
+    # Cancel the asyncio task (cancel() returns False when it has already finished)
+    if task is not None and task.cancel():
+        try:
+            async with asyncio.timeout(2.0):
+                await task
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+
 @router.post("/knowledge-items/stop/{progress_id}")
 async def stop_crawl_task(progress_id: str):
     """Stop a running crawl task."""
     try:
-        from ..services.knowledge.crawl_orchestration_service import get_active_orchestration, unregister_orchestration
-        
-        # Emit stopping status immediately
-        await sio.emit('crawl:stopping', {
-            'progressId': progress_id,
-            'message': 'Stopping crawl operation...',
-            'timestamp': datetime.utcnow().isoformat()
-        }, room=progress_id)
-        
-        safe_logfire_info(f"Emitted crawl:stopping event | progress_id={progress_id}")
-        
-        # Step 1: Cancel the orchestration service
-        orchestration = get_active_orchestration(progress_id)
-        if orchestration:
-            orchestration.cancel()
-        
-        # Step 2: Cancel the asyncio task
-        if progress_id in active_crawl_tasks:
-            task = active_crawl_tasks[progress_id]
-            if not task.done():
-                task.cancel()
-                try:
-                    await asyncio.wait_for(task, timeout=2.0)
-                except (asyncio.CancelledError, asyncio.TimeoutError):
-                    pass
-            del active_crawl_tasks[progress_id]
-        
-        # Step 3: Remove from active orchestrations registry
-        unregister_orchestration(progress_id)
-        
-        # Step 4: Send Socket.IO event
-        await sio.emit('crawl:stopped', {
-            'progressId': progress_id,
-            'status': 'cancelled',
-            'message': 'Crawl cancelled by user',
-            'timestamp': datetime.utcnow().isoformat()
-        }, room=progress_id)
+        # One timestamp for the whole stop request, shared by both events
+        timestamp = iso_now()
+        
+        # Fast path: nothing is running under this id (e.g. a stale UI), so just confirm the stop
+        from ..services.knowledge.crawl_orchestration_service import get_active_orchestration
+        if progress_id not in active_crawl_tasks and get_active_orchestration(progress_id) is None:
+            if room_has_members(progress_id):
+                await emit_crawl_stopped(progress_id, 'Crawl cancelled by user', timestamp)
+            safe_logfire_info(f"No active crawl to stop | progress_id={progress_id}")
+            return {**_STOP_OK_TEMPLATE, 'progressId': progress_id}
+        
+        # Steps 1-2: Emit stopping status while the orchestration and task are being cancelled
+        # (events are skipped when no client is subscribed to the crawl's room)
+        # The cancellation is shielded so it still completes if this request is cancelled
+        stop_steps = [asyncio.shield(_cancel_active_crawl_task(progress_id))]
+        if room_has_members(progress_id):
+            stop_steps.insert(0, sio.emit('crawl:stopping', {
+                'progressId': progress_id,
+                'message': 'Stopping crawl operation...',
+                'timestamp': timestamp
+            }, room=progress_id))
+            safe_logfire_info(f"Emitting crawl:stopping event | progress_id={progress_id}")
+        await asyncio.gather(*stop_steps)
+        
+        # Step 3: Send Socket.IO event
+        if room_has_members(progress_id):
+            await emit_crawl_stopped(progress_id, 'Crawl cancelled by user', timestamp)
         
         safe_logfire_info(f"Successfully stopped crawl task | progress_id={progress_id}")
-        return {
-            'success': True,
-            'message': 'Crawl task stopped successfully',
-            'progressId': progress_id
-        }
+        return {**_STOP_OK_TEMPLATE, 'progressId': progress_id}
             
     except HTTPException:
         raise
@@ -838,3 +856,62 @@ async def stop_crawl_task(progress_id: str):
         safe_logfire_error(f"Failed to stop crawl task | error={str(e)} | progress_id={progress_id}")
         raise HTTPException(status_code=500, detail={'error': str(e)}) 
 
+
+
+async def stop_many(progress_ids: List[str]) -> List[dict]:
+    """Stop several crawls in one pass: drain both registries, cancel everything, then notify each room."""
+    from ..services.knowledge.crawl_orchestration_service import get_active_orchestration, unregister_orchestration
+    
+    # Repeated ids would get repeated stop events and close_room calls
+    progress_ids = list(dict.fromkeys(progress_ids))
+    timestamp = iso_now()
+    
+    # Drain both registries before the first await so concurrent stops can't race on them
+    pending_tasks = []
+    running_ids = []
+    for progress_id in progress_ids:
+        orchestration = get_active_orchestration(progress_id)
+        if orchestration:
+            orchestration.cancel()
+        unregister_orchestration(progress_id)
+        
+        task = active_crawl_tasks.pop(progress_id, None)
+        if task is not None and task.cancel():
+            pending_tasks.append(task)
+        if orchestration or task is not None:
+            running_ids.append(progress_id)
+    
+    # Like a single stop, rooms of running crawls hear crawl:stopping while the
+    # cancelled tasks are awaited together, bounded by the same 2s
+    stop_steps = [
+        sio.emit('crawl:stopping', {
+            'progressId': progress_id,
+            'message': 'Stopping crawl operation...',
+            'timestamp': timestamp
+        }, room=progress_id)
+        for progress_id in running_ids
+        if room_has_members(progress_id)
+    ]
+    if pending_tasks:
+        stop_steps.append(asyncio.shield(asyncio.wait(pending_tasks, timeout=2.0)))
+    await asyncio.gather(*stop_steps)
+    
+    # Each room gets its own event since clients filter on progressId
+    await asyncio.gather(*(
+        emit_crawl_stopped(progress_id, 'Crawl cancelled by user', timestamp)
+        for progress_id in progress_ids
+        if room_has_members(progress_id)
+    ))
+    
+    safe_logfire_info(f"Stopped crawl tasks | count={len(progress_ids)} | cancelled={len(pending_tasks)}")
+    return [{**_STOP_OK_TEMPLATE, 'progressId': progress_id} for progress_id in progress_ids]
+
+@router.post("/knowledge-items/stop")
+async def stop_crawl_tasks(request: StopCrawlsRequest):
+    """Stop several running crawl tasks at once."""
+    try:
+        results = await stop_many(request.progress_ids)
+        return {'success': True, 'results': results}
+    except Exception as e:
+        safe_logfire_error(f"Failed to stop crawl tasks | error={str(e)} | progress_ids={request.progress_ids}")
+        raise HTTPException(status_code=500, detail={'error': str(e)})
@@ -35,7 +35,7 @@ from ..services.projects.document_service import DocumentService
 from ..services.projects.versioning_service import VersioningService
 
 # Import Socket.IO broadcast functions from socketio_handlers
-from .socketio_handlers import broadcast_project_update
+from .socketio_handlers import request_project_update
 
 router = APIRouter(prefix="/api", tags=["projects"])
 
@@ -162,7 +162,7 @@ async def _create_project_with_ai(progress_id: str, request: CreateProjectReques
         
         if success:
             # Broadcast project list update
-            await broadcast_project_update()
+            request_project_update()
             
             # Complete the operation
             await progress_service.complete_operation(progress_id, {
@@ -371,8 +371,8 @@ async def update_project(project_id: str, request: UpdateProjectRequest):
             # Format project response with sources using SourceLinkingService
             formatted_project = source_service.format_project_with_sources(project)
             
-            # Broadcast project list update to Socket.IO clients
-            await broadcast_project_update()
+            # Broadcast project list update to Socket.IO clients (debounced)
+            request_project_update()
             
             logfire.info(f"Project updated successfully | project_id={project_id} | title={project.get('title')} | technical_sources={len(formatted_project.get('technical_sources', []))} | business_sources={len(formatted_project.get('business_sources', []))}")
             
@@ -400,8 +400,8 @@ async def delete_project(project_id: str):
             else:
                 raise HTTPException(status_code=500, detail=result)
         
-        # Broadcast project list update to Socket.IO clients
-        await broadcast_project_update()
+        # Broadcast project list update to Socket.IO clients (debounced)
+        request_project_update()
         
         logfire.info(f"Project deleted successfully | project_id={project_id} | deleted_tasks={result.get('deleted_tasks', 0)}")
         
@@ -8,7 +8,9 @@ Keeps the main projects_api.py file focused on REST endpoints.
 # Removed direct logging import - using unified config
 import asyncio
 import time
-from typing import Dict
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
 from ..socketio_app import get_socketio_instance
 from ..services.projects.project_service import ProjectService
 from ..services.projects.source_linking_service import SourceLinkingService
@@ -22,15 +24,74 @@ logger = get_logger(__name__)
 sio = get_socketio_instance()
 logger.info(f"🔗 [SOCKETIO] Socket.IO instance ID: {id(sio)}")
 
-# Rate limiting for Socket.IO broadcasts
-_last_broadcast_times: Dict[str, float] = {}
+# Rate limiting for Socket.IO broadcasts (oldest-first LRU so it stays bounded under churn)
+_last_broadcast_times: OrderedDict[str, float] = OrderedDict()
 _min_broadcast_interval = 0.1  # Minimum 100ms between broadcasts per room
+_max_tracked_broadcast_rooms = 256
+
+# Statuses that always bypass rate limiting
+_IMPORTANT_STATUSES = frozenset({'error', 'completed', 'complete', 'starting'})
+
+# Statuses after which a room's rate limiting state is dropped right away
+_TERMINAL_STATUSES = frozenset({'error', 'completed', 'complete'})
+
+
+# Coalescing for rate-limited crawl progress: only the newest payload per room is kept
+_pending_crawl_progress: Dict[str, dict] = {}
+_crawl_flush_tasks: Dict[str, asyncio.Task] = {}
+
+# Signalled by crawl_subscribe so background crawls can start as soon as the client is listening
+_crawl_subscribed_events: Dict[str, asyncio.Event] = {}
+
+# Shared service instances - each construction creates a new Supabase client
+_project_service: Optional[ProjectService] = None
+_source_linking_service: Optional[SourceLinkingService] = None
+
+def get_project_service() -> ProjectService:
+    """Get or create the ProjectService shared by Socket.IO broadcasts."""
+    global _project_service
+    if _project_service is None:
+        _project_service = ProjectService()
+    return _project_service
+
+def get_source_linking_service() -> SourceLinkingService:
+    """Get or create the SourceLinkingService shared by Socket.IO broadcasts."""
+    global _source_linking_service
+    if _source_linking_service is None:
+        _source_linking_service = SourceLinkingService()
+    return _source_linking_service
+
+# Strong references to fire-and-forget broadcasts so they aren't garbage collected mid-flight
+_background_broadcasts: Set[asyncio.Task] = set()
+
+def spawn_broadcast(coro) -> asyncio.Task:
+    """Schedule a broadcast without awaiting it, keeping the task alive until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_broadcasts.add(task)
+    task.add_done_callback(_background_broadcasts.discard)
+    return task
 
 # Broadcast helper functions
+def room_has_members(room: str) -> bool:
+    """Check whether any client is currently in a room of the default namespace."""
+    return bool(sio.manager.rooms.get('/', {}).get(room))
+
+async def _safe_emit(event: str, data: dict, *, room) -> bool:
+    """Emit to a room, logging instead of raising so broadcasts never break the caller."""
+    try:
+        await sio.emit(event, data, room=room)
+        return True
+    except Exception as e:
+        logger.error(f"❌ [SOCKETIO] Failed to emit {event}: {e}")
+        logger.error(f"Error type: {type(e).__name__}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return False
+
 async def broadcast_task_update(project_id: str, event_type: str, task_data: dict):
     """Broadcast task updates to project room."""
-    await sio.emit(event_type, task_data, room=project_id)
-    logger.info(f"Broadcasted {event_type} to project {project_id}")
+    if await _safe_emit(event_type, task_data, room=project_id):
+        logger.info(f"Broadcasted {event_type} to project {project_id}")
 
 # Enhanced Task-Specific Socket.IO Event Handlers
 async def broadcast_task_created(project_id: str, task_data: dict):
@@ -68,8 +129,12 @@ async def broadcast_task_batch_update(project_id: str, batch_data: dict):
 
 async def broadcast_project_update():
     """Broadcast project list to subscribers."""
+    # Skip the project query and formatting entirely when nobody is watching
+    if not room_has_members('project_list'):
+        return
+    
     try:
-        project_service = ProjectService()
+        project_service = get_project_service()
         success, result = project_service.list_projects()
         
         if not success:
@@ -77,7 +142,7 @@ async def broadcast_project_update():
             return
         
         # Use SourceLinkingService to format projects with sources
-        source_service = SourceLinkingService()
+        source_service = get_source_linking_service()
         formatted_projects = source_service.format_projects_with_sources(result["projects"])
         
         await sio.emit('projects_update', {'projects': formatted_projects}, room='project_list')
@@ -86,56 +151,77 @@ async def broadcast_project_update():
     except Exception as e:
         logger.error(f"Failed to broadcast project update: {e}")
 
+# Debounce window for project list broadcasts - bursts of updates collapse into one refetch
+_project_update_debounce = 0.05
+_project_update_task: Optional[asyncio.Task] = None
+
+def request_project_update():
+    """Schedule a debounced project list broadcast without awaiting it."""
+    global _project_update_task
+    if _project_update_task is None or _project_update_task.done():
+        _project_update_task = spawn_broadcast(_debounced_project_update())
+
+async def _debounced_project_update():
+    """Wait out the debounce window, then broadcast the project list once."""
+    global _project_update_task
+    await asyncio.sleep(_project_update_debounce)
+    # Requests arriving while we fetch need fresh data, so let them schedule a new run
+    _project_update_task = None
+    await broadcast_project_update()
+
 async def broadcast_progress_update(progress_id: str, progress_data: dict):
     """Broadcast progress updates to progress room."""
-    await sio.emit('project_progress', progress_data, room=progress_id)
-    logger.debug(f"Broadcasted progress update for {progress_id}")
+    if await _safe_emit('project_progress', progress_data, room=progress_id):
+        logger.debug(f"Broadcasted progress update for {progress_id}")
 
 async def broadcast_crawl_progress(progress_id: str, data: dict):
-    """Broadcast crawl progress to subscribers with resilience and rate limiting."""
-    # Ensure progressId is included in the data
-    data['progressId'] = progress_id
+    """Broadcast crawl progress to subscribers with resilience and rate limiting.
+    
+    The caller's dict is never mutated, so callers don't need to copy it first.
+    """
+    # Ensure progressId is included in the data (C-level merge into a new dict)
+    data = {**data, 'progressId': progress_id}
     
-    # Rate limiting: Check if we've broadcasted too recently
-    current_time = time.time()
+    # Rate limiting: Check if we've broadcasted too recently (monotonic loop clock)
+    current_time = asyncio.get_running_loop().time()
     last_broadcast = _last_broadcast_times.get(progress_id, 0)
     time_since_last = current_time - last_broadcast
     
     # Skip this update if it's too soon (except for important statuses)
-    important_statuses = ['error', 'completed', 'complete', 'starting']
     current_status = data.get('status', '')
     
-    if time_since_last < _min_broadcast_interval and current_status not in important_statuses:
-        # Skip this update - too frequent
+    if time_since_last < _min_broadcast_interval and current_status not in _IMPORTANT_STATUSES:
+        # Too frequent - keep the newest payload and flush it once the interval has passed
+        _pending_crawl_progress[progress_id] = data
+        if progress_id not in _crawl_flush_tasks:
+            delay = _min_broadcast_interval - time_since_last
+            _crawl_flush_tasks[progress_id] = asyncio.create_task(
+                _flush_pending_crawl_progress(progress_id, delay)
+            )
         return
     
-    # Update last broadcast time
-    _last_broadcast_times[progress_id] = current_time
+    # This update supersedes any coalesced one still waiting to be flushed
+    _pending_crawl_progress.pop(progress_id, None)
     
-    # Clean up old entries (older than 5 minutes)
-    if len(_last_broadcast_times) > 100:  # Only clean when it gets large
-        cutoff_time = current_time - 300  # 5 minutes
-        old_keys = [pid for pid, t in _last_broadcast_times.items() if t <= cutoff_time]
-        for key in old_keys:
-            del _last_broadcast_times[key]
+    # Update last broadcast time, evicting eagerly once the crawl has finished
+    if current_status in _TERMINAL_STATUSES:
+        _last_broadcast_times.pop(progress_id, None)
+    else:
+        _last_broadcast_times[progress_id] = current_time
+        _last_broadcast_times.move_to_end(progress_id)
+        if len(_last_broadcast_times) > _max_tracked_broadcast_rooms:
+            _last_broadcast_times.popitem(last=False)
     
     # Add resilience - don't let Socket.IO errors crash the crawl
     try:
-        # Get detailed room info for debugging
-        room_sids = []
-        all_rooms = {}
-        if hasattr(sio.manager, 'rooms'):
-            # Get all rooms for all namespaces
-            for namespace in sio.manager.rooms:
-                all_rooms[namespace] = {}
-                for room, sids in sio.manager.rooms[namespace].items():
-                    all_rooms[namespace][room] = list(sids)
-                    if namespace == '/' and room == progress_id:
-                        room_sids = list(sids)
+        # Get detailed room info for debugging - look the room up directly
+        # instead of copying every room's member set on each broadcast
+        namespace_rooms = sio.manager.rooms.get('/', {}) if hasattr(sio.manager, 'rooms') else {}
+        room_sids = namespace_rooms.get(progress_id) or ()
         
         print(f"📢 [SOCKETIO DEBUG] Broadcasting to room '{progress_id}'")
-        print(f"📢 [SOCKETIO DEBUG] Room {progress_id} has {len(room_sids)} subscribers: {room_sids}")
-        print(f"📢 [SOCKETIO DEBUG] All rooms in namespace '/': {list(all_rooms.get('/', {}).keys())}")
+        print(f"📢 [SOCKETIO DEBUG] Room {progress_id} has {len(room_sids)} subscribers: {list(room_sids)}")
+        print(f"📢 [SOCKETIO DEBUG] All rooms in namespace '/': {list(namespace_rooms.keys())}")
         
         # Log if the room doesn't exist
         if not room_sids:
@@ -148,20 +234,67 @@ async def broadcast_crawl_progress(progress_id: str, data: dict):
         traceback.print_exc()
     
     # Log only important broadcasts (reduce log spam)
-    if current_status in important_statuses or data.get('percentage', 0) % 10 == 0:
+    if current_status in _IMPORTANT_STATUSES or data.get('percentage', 0) % 10 == 0:
         logger.info(f"📢 [SOCKETIO] Broadcasting crawl_progress to room: {progress_id} | status={current_status} | progress={data.get('percentage', 'N/A')}%")
     
-    # Emit the event with error handling
-    try:
-        await sio.emit('crawl_progress', data, room=progress_id)
+    # Emit the event - crawl should not fail due to Socket.IO issues
+    if await _safe_emit('crawl_progress', data, room=progress_id):
         logger.info(f"✅ [SOCKETIO] Broadcasted crawl progress for {progress_id}")
-    except Exception as e:
-        # Don't let Socket.IO errors crash the crawl
-        logger.error(f"❌ [SOCKETIO] Failed to emit crawl_progress: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        # Continue execution - crawl should not fail due to Socket.IO issues
+
+async def _flush_pending_crawl_progress(progress_id: str, delay: float):
+    """Emit the newest coalesced crawl progress update once the rate limit window has passed."""
+    try:
+        await asyncio.sleep(delay)
+    finally:
+        _crawl_flush_tasks.pop(progress_id, None)
+    
+    data = _pending_crawl_progress.pop(progress_id, None)
+    if data is not None:
+        await broadcast_crawl_progress(progress_id, data)
+
+async def wait_for_crawl_subscriber(progress_id: str, timeout: float = 1.0) -> bool:
+    """Wait until a client joins the crawl progress room, giving up after timeout seconds."""
+    if room_has_members(progress_id):
+        return True
+    
+    event = _crawl_subscribed_events.setdefault(progress_id, asyncio.Event())
+    try:
+        async with asyncio.timeout(timeout):
+            await event.wait()
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        # A concurrent waiter may have registered its own event under this id since
+        if _crawl_subscribed_events.get(progress_id) is event:
+            del _crawl_subscribed_events[progress_id]
+
+# ISO timestamp cache for stop events: (epoch millisecond, formatted string)
+_iso_now_cache = (0, '')
+
+def iso_now() -> str:
+    """Current UTC time as a millisecond ISO string, formatted at most once per millisecond."""
+    global _iso_now_cache
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _iso_now_cache[0]:
+        timestamp = datetime.fromtimestamp(now_ms / 1000, timezone.utc).isoformat(timespec='milliseconds')
+        _iso_now_cache = (now_ms, timestamp)
+    return _iso_now_cache[1]
+
+async def emit_crawl_stopped(progress_id: str, message: str, timestamp: str):
+    """Tell a crawl's room it was cancelled with crawl:stopped."""
+    data = {
+        'progressId': progress_id,
+        'status': 'cancelled',
+        'message': message,
+        'timestamp': timestamp
+    }
+    await sio.emit('crawl:stopped', data, room=progress_id)
+    
+    # The crawl is over: release the room and any rate limiting state kept for it
+    await sio.close_room(progress_id)
+    _last_broadcast_times.pop(progress_id, None)
+    _pending_crawl_progress.pop(progress_id, None)
 
 # Crawl progress helper functions for knowledge API
 async def start_crawl_progress(progress_id: str, data: dict):
@@ -216,11 +349,10 @@ async def connect(sid, environ):
     # Log total connected clients
     try:
         if hasattr(sio.manager, 'rooms'):
-            all_sids = set()
-            for namespace_rooms in sio.manager.rooms.values():
-                for room_sids in namespace_rooms.values():
-                    all_sids.update(room_sids)
-            print(f'📊 [SOCKETIO DEBUG] Total connected clients: {len(all_sids)}')
+            # Every connected sid is a member of the namespace-wide `None` room,
+            # so its size is the client count without scanning every room
+            connected = sio.manager.rooms.get('/', {}).get(None, ())
+            print(f'📊 [SOCKETIO DEBUG] Total connected clients: {len(connected)}')
     except:
         pass
 
@@ -265,7 +397,7 @@ async def subscribe_projects(sid, data=None):
     
     # Send current project list using ProjectService
     try:
-        project_service = ProjectService()
+        project_service = get_project_service()
         success, result = project_service.list_projects()
         
         if not success:
@@ -273,7 +405,7 @@ async def subscribe_projects(sid, data=None):
             return
         
         # Use SourceLinkingService to format projects with sources
-        source_service = SourceLinkingService()
+        source_service = get_source_linking_service()
         formatted_projects = source_service.format_projects_with_sources(result["projects"])
         
         await sio.emit('projects_update', {'projects': formatted_projects}, to=sid)
@@ -345,6 +477,11 @@ async def crawl_subscribe(sid, data=None):
     # Enter the room
     await sio.enter_room(sid, progress_id)
     logger.info(f"✅ [SOCKETIO] Client {sid} subscribed to crawl progress room: {progress_id}")
+    
+    # Wake up a crawl that is waiting for its first subscriber
+    subscribed_event = _crawl_subscribed_events.get(progress_id)
+    if subscribed_event is not None:
+        subscribed_event.set()
     print(f"✅ Client {sid} subscribed to crawl progress {progress_id}")
     
     # Verify room membership
@@ -377,8 +514,8 @@ async def crawl_subscribe(sid, data=None):
         
         # Double-check room membership by listing all members
         if hasattr(sio.manager, 'rooms'):
-            room_members = list(sio.manager.rooms.get('/', {}).get(progress_id, []))
-            print(f"📥 [SOCKETIO DEBUG] Room '{progress_id}' now has {len(room_members)} members: {room_members}")
+            room_members = sio.manager.rooms.get('/', {}).get(progress_id) or ()
+            print(f"📥 [SOCKETIO DEBUG] Room '{progress_id}' now has {len(room_members)} members: {list(room_members)}")
             print(f"📥 [SOCKETIO DEBUG] Client {sid} is in room: {sid in room_members}")
             
     except Exception as e:
@@ -468,14 +605,15 @@ async def crawl_stop(sid, data):
     
     logger.info(f"🛑 [SOCKETIO] Received crawl_stop request | sid={sid} | progress_id={progress_id}")
     
-    # Emit stopping status immediately
-    await sio.emit('crawl:stopping', {
-        'progressId': progress_id,
-        'message': 'Stopping crawl operation...',
-        'timestamp': time.time()
-    }, room=progress_id)
-    
-    logger.info(f"📤 [SOCKETIO] Emitted crawl:stopping event to room {progress_id}")
+    # Emit stopping status immediately (skipped when nobody is in the room)
+    if room_has_members(progress_id):
+        await sio.emit('crawl:stopping', {
+            'progressId': progress_id,
+            'message': 'Stopping crawl operation...',
+            'timestamp': iso_now()
+        }, room=progress_id)
+        
+        logger.info(f"📤 [SOCKETIO] Emitted crawl:stopping event to room {progress_id}")
     
     try:
         # Get the orchestration service
@@ -491,29 +629,24 @@ async def crawl_stop(sid, data):
         
         # Cancel the asyncio task if it exists
         from ..fastapi.knowledge_api import active_crawl_tasks
-        if progress_id in active_crawl_tasks:
-            task = active_crawl_tasks[progress_id]
-            if not task.done():
-                task.cancel()
+        task = active_crawl_tasks.pop(progress_id, None)
+        if task is not None:
+            # cancel() is a no-op returning False when the task has already finished
+            if task.cancel():
                 try:
-                    await asyncio.wait_for(task, timeout=2.0)
+                    async with asyncio.timeout(2.0):
+                        await task
                 except (asyncio.CancelledError, asyncio.TimeoutError):
                     pass
-            del active_crawl_tasks[progress_id]
             logger.info(f"✅ [SOCKETIO] Cancelled asyncio task for {progress_id}")
         
         # Remove from active orchestrations registry
         unregister_orchestration(progress_id)
         
         # Broadcast cancellation to all clients in the room
-        await sio.emit('crawl:stopped', {
-            'progressId': progress_id,
-            'status': 'cancelled',
-            'message': 'Crawl operation cancelled',
-            'timestamp': time.time()
-        }, room=progress_id)
-        
-        logger.info(f"📤 [SOCKETIO] Emitted crawl:stopped event to room {progress_id}")
+        if room_has_members(progress_id):
+            await emit_crawl_stopped(progress_id, 'Crawl operation cancelled', iso_now())
+            logger.info(f"📤 [SOCKETIO] Emitted crawl stop event to room {progress_id}")
         
         return {'success': True, 'progressId': progress_id}
         
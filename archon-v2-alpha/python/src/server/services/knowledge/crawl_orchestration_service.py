@@ -5,10 +5,11 @@ Handles the orchestration of crawling operations with progress tracking.
 Extracted from the monolithic _perform_crawl_with_progress function in knowledge_api.py.
 """
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from urllib.parse import urlparse
 from queue import Queue
 import uuid
+import weakref
 
 from ...config.logfire_config import safe_logfire_info, safe_logfire_error
 from ..rag.crawling_service import CrawlingService
@@ -20,8 +21,14 @@ from ...fastapi.socketio_handlers import update_crawl_progress
 from ..source_management_service import update_source_info, extract_source_summary
 from .progress_mapper import ProgressMapper
 
-# Global registry to track active orchestration services for cancellation support
-_active_orchestrations: Dict[str, 'CrawlOrchestrationService'] = {}
+# Global registry to track active orchestration services for cancellation support.
+# Weak values so an orchestration that misses its unregister call doesn't leak;
+# a running service stays alive through its task in _running_orchestration_tasks.
+_active_orchestrations: 'weakref.WeakValueDictionary[str, CrawlOrchestrationService]' = weakref.WeakValueDictionary()
+
+# Strong references to running orchestration tasks (the event loop only keeps weak ones);
+# each task's coroutine in turn keeps its service alive until the crawl finishes
+_running_orchestration_tasks: Set[asyncio.Task] = set()
 
 def get_active_orchestration(progress_id: str) -> Optional['CrawlOrchestrationService']:
     """Get an active orchestration service by progress ID."""
@@ -33,8 +40,7 @@ def register_orchestration(progress_id: str, orchestration: 'CrawlOrchestrationS
 
 def unregister_orchestration(progress_id: str):
     """Unregister an orchestration service."""
-    if progress_id in _active_orchestrations:
-        del _active_orchestrations[progress_id]
+    _active_orchestrations.pop(progress_id, None)
 
 
 class CrawlOrchestrationService:
@@ -63,6 +69,7 @@ class CrawlOrchestrationService:
         self.progress_mapper = ProgressMapper()
         # Cancellation support
         self._cancelled = False
+        self._orchestration_task: Optional[asyncio.Task] = None
     
     def set_progress_id(self, progress_id: str):
         """Set the progress ID for Socket.IO updates."""
@@ -71,6 +78,10 @@ class CrawlOrchestrationService:
     def cancel(self):
         """Cancel the crawl operation."""
         self._cancelled = True
+        # Interrupt the background crawl too, so an in-flight page stream is closed now
+        # rather than at the next _check_cancellation() between stages
+        if self._orchestration_task is not None:
+            self._orchestration_task.cancel()
         safe_logfire_info(f"Crawl operation cancelled | progress_id={self.progress_id}")
     
     def is_cancelled(self) -> bool:
@@ -280,7 +291,9 @@ class CrawlOrchestrationService:
             register_orchestration(self.progress_id, self)
         
         # Start the crawl as an async task in the main event loop
-        asyncio.create_task(self._async_orchestrate_crawl(request, task_id))
+        self._orchestration_task = asyncio.create_task(self._async_orchestrate_crawl(request, task_id))
+        _running_orchestration_tasks.add(self._orchestration_task)
+        self._orchestration_task.add_done_callback(_running_orchestration_tasks.discard)
         
         # Return immediately
         return {
@@ -8,6 +8,7 @@ single page crawling, batch crawling, and recursive crawling.
 
 # Removed direct logging import - using unified config
 import asyncio
+from contextlib import aclosing
 from typing import List, Dict, Any
 from urllib.parse import urlparse, urldefrag
 from xml.etree import ElementTree
@@ -59,6 +60,9 @@ class CrawlingService:
         ".highlight pre"
     ]
     
+    # Exponential backoff delays (seconds) per retry attempt; later attempts reuse the last value
+    RETRY_BACKOFF_DELAYS = tuple(2 ** attempt for attempt in range(6))
+    
     def __init__(self, crawler=None, supabase_client=None):
         """Initialize with optional crawler and supabase client"""
         self.crawler = crawler
@@ -212,6 +216,7 @@ class CrawlingService:
         last_error = None
         
         for attempt in range(retry_count):
+            backoff = self.RETRY_BACKOFF_DELAYS[min(attempt, len(self.RETRY_BACKOFF_DELAYS) - 1)]
             try:
                 if not self.crawler:
                     logger.error(f"No crawler instance available for URL: {url}")
@@ -275,7 +280,7 @@ class CrawlingService:
                     last_error = f"Crawler exception for {url}: {str(e)}"
                     logger.error(last_error)
                     if attempt < retry_count - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        await asyncio.sleep(backoff)
                     continue
                 
                 if not result.success:
@@ -284,7 +289,7 @@ class CrawlingService:
                     
                     # Exponential backoff before retry
                     if attempt < retry_count - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        await asyncio.sleep(backoff)
                     continue
                 
                 # Validate content
@@ -293,7 +298,7 @@ class CrawlingService:
                     logger.warning(f"Crawl attempt {attempt + 1}: {last_error}")
                     
                     if attempt < retry_count - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        await asyncio.sleep(backoff)
                     continue
                 
                 # Success! Return both markdown AND HTML
@@ -331,7 +336,7 @@ class CrawlingService:
             
             # Exponential backoff before retry
             if attempt < retry_count - 1:
-                await asyncio.sleep(2 ** attempt)
+                await asyncio.sleep(backoff)
         
         # All retries failed
         return {
@@ -479,25 +484,27 @@ class CrawlingService:
             
             # Handle streaming results
             j = 0
-            async for result in batch_results:
-                processed += 1
-                if result.success and result.markdown:
-                    # Map back to original URL
-                    original_url = url_mapping.get(result.url, result.url)
-                    successful_results.append({
-                        'url': original_url, 
-                        'markdown': result.markdown,
-                        'html': result.html  # Use raw HTML
-                    })
-                else:
-                    logger.warning(f"Failed to crawl {result.url}: {getattr(result, 'error_message', 'Unknown error')}")
+            # Close the stream right away if the crawl is cancelled mid-batch
+            async with aclosing(batch_results):
+                async for result in batch_results:
+                    processed += 1
+                    if result.success and result.markdown:
+                        # Map back to original URL
+                        original_url = url_mapping.get(result.url, result.url)
+                        successful_results.append({
+                            'url': original_url, 
+                            'markdown': result.markdown,
+                            'html': result.html  # Use raw HTML
+                        })
+                    else:
+                        logger.warning(f"Failed to crawl {result.url}: {getattr(result, 'error_message', 'Unknown error')}")
                 
-                # Report individual URL progress with smooth increments
-                progress_percentage = start_progress + int((processed / total_urls) * (end_progress - start_progress))
-                # Report more frequently for smoother progress
-                if processed % 5 == 0 or processed == total_urls:  # Report every 5 URLs or at the end
-                    await report_progress(progress_percentage, f'Crawled {processed}/{total_urls} pages ({len(successful_results)} successful)')
-                j += 1
+                    # Report individual URL progress with smooth increments
+                    progress_percentage = start_progress + int((processed / total_urls) * (end_progress - start_progress))
+                    # Report more frequently for smoother progress
+                    if processed % 5 == 0 or processed == total_urls:  # Report every 5 URLs or at the end
+                        await report_progress(progress_percentage, f'Crawled {processed}/{total_urls} pages ({len(successful_results)} successful)')
+                    j += 1
         
         await report_progress(end_progress, f'Batch crawling completed: {len(successful_results)}/{total_urls} pages successful')
         return successful_results
@@ -618,43 +625,45 @@ class CrawlingService:
                 
                 # Handle streaming results from arun_many
                 i = 0
-                async for result in batch_results:
-                    # Map back to original URL if transformed
-                    original_url = result.url
-                    for orig_url in batch_urls:
-                        if self._transform_github_url(orig_url) == result.url:
-                            original_url = orig_url
-                            break
+                # Close the stream right away if the crawl is cancelled mid-batch
+                async with aclosing(batch_results):
+                    async for result in batch_results:
+                        # Map back to original URL if transformed
+                        original_url = result.url
+                        for orig_url in batch_urls:
+                            if self._transform_github_url(orig_url) == result.url:
+                                original_url = orig_url
+                                break
                     
-                    norm_url = normalize_url(original_url)
-                    visited.add(norm_url)
-                    total_processed += 1
+                        norm_url = normalize_url(original_url)
+                        visited.add(norm_url)
+                        total_processed += 1
                     
-                    if result.success and result.markdown:
-                        results_all.append({
-                            'url': original_url, 
-                            'markdown': result.markdown,
-                            'html': result.html  # Always use raw HTML for code extraction
-                        })
-                        depth_successful += 1
+                        if result.success and result.markdown:
+                            results_all.append({
+                                'url': original_url, 
+                                'markdown': result.markdown,
+                                'html': result.html  # Always use raw HTML for code extraction
+                            })
+                            depth_successful += 1
                         
-                        # Find internal links for next depth
-                        for link in result.links.get("internal", []):
-                            next_url = normalize_url(link["href"])
-                            if next_url not in visited:
-                                next_level_urls.add(next_url)
-                    else:
-                        logger.warning(f"Failed to crawl {original_url}: {getattr(result, 'error_message', 'Unknown error')}")
+                            # Find internal links for next depth
+                            for link in result.links.get("internal", []):
+                                next_url = normalize_url(link["href"])
+                                if next_url not in visited:
+                                    next_level_urls.add(next_url)
+                        else:
+                            logger.warning(f"Failed to crawl {original_url}: {getattr(result, 'error_message', 'Unknown error')}")
                     
-                    # Report progress every few URLs
-                    current_idx = batch_idx + i + 1
-                    if current_idx % 5 == 0 or current_idx == len(urls_to_crawl):
-                        current_progress = depth_start + int((current_idx / len(urls_to_crawl)) * (depth_end - depth_start))
-                        await report_progress(current_progress,
-                                            f'Depth {depth + 1}: processed {current_idx}/{len(urls_to_crawl)} URLs ({depth_successful} successful)',
-                                            totalPages=total_processed, 
-                                            processedPages=len(results_all))
-                    i += 1
+                        # Report progress every few URLs
+                        current_idx = batch_idx + i + 1
+                        if current_idx % 5 == 0 or current_idx == len(urls_to_crawl):
+                            current_progress = depth_start + int((current_idx / len(urls_to_crawl)) * (depth_end - depth_start))
+                            await report_progress(current_progress,
+                                                f'Depth {depth + 1}: processed {current_idx}/{len(urls_to_crawl)} URLs ({depth_successful} successful)',
+                                                totalPages=total_processed, 
+                                                processedPages=len(results_all))
+                        i += 1
 
             current_urls = next_level_urls
             
@@ -12,11 +12,44 @@ import logging
 
 from .config.logfire_config import safe_logfire_info
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - fall back to python-socketio's default json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+class OrjsonCodec:
+    """json-module compatible codec backed by orjson for Socket.IO packet encoding."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # Socket.IO passes stdlib options like separators; orjson output is already compact
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+class JsonPacket(socketio.packet.Packet):
+    """
+    Socket.IO packet that skips the binary-attachment scan on outgoing events.
+    
+    Archon only emits JSON payloads built by the server, so the default recursive
+    walk of every payload looking for bytes is wasted work on each broadcast.
+    Incoming binary packets are still decoded normally.
+    """
+    uses_binary_events = False
+
+
 # Create Socket.IO server with FastAPI integration
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    serializer=JsonPacket,
+    json=OrjsonCodec if orjson is not None else None,
     cors_allowed_origins="*",  # TODO: Configure for production with specific origins
     logger=False,  # Disable verbose Socket.IO logging
     engineio_logger=False,  # Disable verbose Engine.IO logging
@@ -14,20 +14,26 @@ Requirements:
     - Playwright installed (via crawl4ai dependency)
 """
 
+from __future__ import annotations
+
 import asyncio
 import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from urllib.parse import quote
 import argparse
+from importlib.util import find_spec
 
-from playwright.async_api import async_playwright, Page, Browser
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
+# Playwright and Supabase are imported where they're used so argument errors and --help return quickly
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Browser
+    from supabase import Client
+
 # Load environment variables
 # When in Docker, load from the mounted .env file
 if os.path.exists('/.dockerenv') and os.path.exists('/app/.env'):
@@ -50,6 +56,7 @@ class PRPViewerTester:
         if not supabase_url or not supabase_key:
             raise ValueError("Missing Supabase credentials in environment")
             
+        from supabase import create_client
         self.supabase: Client = create_client(supabase_url, supabase_key)
                 # When running inside Docker, use host.docker.internal
         if os.path.exists('/.dockerenv'):
@@ -417,6 +424,7 @@ class PRPViewerTester:
         self.results["summary"]["total_documents"] = len(documents)
         
         # Launch browser
+        from playwright.async_api import async_playwright
         async with async_playwright() as p:
             print("Launching browser...")
                         # Always use headless mode in Docker
@@ -503,8 +511,12 @@ async def main():
     
     args = parser.parse_args()
     
-    # Check if UI server is running
-    import aiohttp
+    # Check required packages are installed without paying for importing them
+    missing = [name for name in ("playwright", "supabase") if find_spec(name) is None]
+    if missing:
+        print(f"Missing required packages: {', '.join(missing)}")
+        print("Install them with: pip install playwright supabase && playwright install chromium")
+        sys.exit(1)
     
     # Determine UI URL based on environment
     if os.path.exists('/.dockerenv'):
@@ -3,6 +3,8 @@ import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 import os
+import sys
+import weakref
 
 # Set test environment
 os.environ["TEST_MODE"] = "true"
@@ -21,6 +23,35 @@ def prevent_real_db_calls():
         yield
 
 
+@pytest.fixture(autouse=True)
+def isolated_crawl_registries(monkeypatch):
+    """Give each test empty crawl task/orchestration registries so tests can't leak into each other."""
+    # Only swap modules that are already loaded; a fresh import starts out empty anyway
+    knowledge_api = sys.modules.get('src.server.fastapi.knowledge_api')
+    if knowledge_api is not None:
+        monkeypatch.setattr(knowledge_api, 'active_crawl_tasks', {})
+    
+    orchestration_module = sys.modules.get('src.server.services.knowledge.crawl_orchestration_service')
+    if orchestration_module is not None:
+        monkeypatch.setattr(orchestration_module, '_active_orchestrations', weakref.WeakValueDictionary())
+    yield
+
+
+@pytest.fixture
+def fake_sio(monkeypatch):
+    """Swap the Socket.IO server used by broadcasts for a mock with an empty default namespace."""
+    from unittest.mock import AsyncMock
+    from src.server.fastapi import knowledge_api, socketio_handlers
+    
+    sio = MagicMock()
+    sio.emit = AsyncMock()
+    sio.close_room = AsyncMock()
+    sio.manager.rooms = {'/': {}}
+    monkeypatch.setattr(socketio_handlers, 'sio', sio)
+    monkeypatch.setattr(knowledge_api, 'sio', sio)
+    return sio
+
+
 @pytest.fixture
 def mock_supabase_client():
     """Mock Supabase client for testing."""
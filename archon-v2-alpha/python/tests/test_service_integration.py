@@ -102,4 +102,120 @@ def test_concurrent_operations(client):
     
     # All should succeed
     for result in results:
-        assert result.status_code == 200
\ No newline at end of file
+        assert result.status_code == 200
+
+
+async def test_stop_crawl_cleanup_survives_cancellation():
+    """Test that a cancelled stop request still clears the crawl task registry."""
+    import asyncio
+    from src.server.fastapi import knowledge_api
+    
+    crawl_task = asyncio.create_task(asyncio.sleep(10))
+    knowledge_api.active_crawl_tasks["test-progress"] = crawl_task
+    
+    # Cancel the stop request before its cleanup has had a chance to run
+    stop_request = asyncio.create_task(knowledge_api.stop_crawl_task("test-progress"))
+    await asyncio.sleep(0)
+    stop_request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await stop_request
+    
+    # The shielded cleanup keeps running and cancels the crawl
+    with pytest.raises(asyncio.CancelledError):
+        await crawl_task
+    assert "test-progress" not in knowledge_api.active_crawl_tasks
+
+
+async def test_crawl_progress_coalesces_rate_limited_updates(fake_sio):
+    """Test updates inside the rate limit window collapse into one flush of the newest payload."""
+    import asyncio
+    from src.server.fastapi import socketio_handlers
+    
+    for percentage in (10, 20, 30):
+        await socketio_handlers.broadcast_crawl_progress("coalesce-progress", {'status': 'crawling', 'percentage': percentage})
+    assert fake_sio.emit.await_count == 1
+    
+    await asyncio.sleep(socketio_handlers._min_broadcast_interval + 0.05)
+    assert fake_sio.emit.await_count == 2
+    event, data = fake_sio.emit.await_args.args
+    assert event == 'crawl_progress'
+    assert data['percentage'] == 30
+
+
+async def test_project_update_skipped_without_subscribers(fake_sio, monkeypatch):
+    """Test the project list is neither queried nor emitted when nobody is subscribed."""
+    from src.server.fastapi import socketio_handlers
+    
+    project_service = MagicMock()
+    monkeypatch.setattr(socketio_handlers, 'get_project_service', lambda: project_service)
+    
+    await socketio_handlers.broadcast_project_update()
+    
+    project_service.list_projects.assert_not_called()
+    fake_sio.emit.assert_not_awaited()
+
+
+async def test_project_updates_are_debounced(monkeypatch):
+    """Test a burst of project update requests results in a single broadcast."""
+    import asyncio
+    from src.server.fastapi import socketio_handlers
+    
+    broadcast = AsyncMock()
+    monkeypatch.setattr(socketio_handlers, 'broadcast_project_update', broadcast)
+    monkeypatch.setattr(socketio_handlers, '_project_update_task', None)
+    
+    for _ in range(3):
+        socketio_handlers.request_project_update()
+    await asyncio.sleep(socketio_handlers._project_update_debounce + 0.05)
+    
+    broadcast.assert_awaited_once()
+
+
+async def test_stop_unknown_crawl_skips_cancellation(fake_sio, monkeypatch):
+    """Test stopping an id with no running crawl confirms the stop without cancelling anything."""
+    from src.server.fastapi import knowledge_api
+    
+    cancel = AsyncMock()
+    monkeypatch.setattr(knowledge_api, '_cancel_active_crawl_task', cancel)
+    fake_sio.manager.rooms = {'/': {'stale-progress': {'sid-1'}}}
+    
+    result = await knowledge_api.stop_crawl_task("stale-progress")
+    
+    assert result['success'] is True
+    assert result['progressId'] == "stale-progress"
+    cancel.assert_not_called()
+    event, data = fake_sio.emit.await_args.args
+    assert event == 'crawl:stopped'
+    assert data['status'] == 'cancelled'
+
+
+async def test_stop_many_cancels_every_crawl(fake_sio):
+    """Test stop_many cancels all listed crawls and reports each id."""
+    import asyncio
+    from src.server.fastapi import knowledge_api
+    
+    crawl_tasks = {progress_id: asyncio.create_task(asyncio.sleep(10)) for progress_id in ("batch-1", "batch-2")}
+    knowledge_api.active_crawl_tasks.update(crawl_tasks)
+    fake_sio.manager.rooms = {'/': {'batch-1': {'sid-1'}}}
+    
+    results = await knowledge_api.stop_many(["batch-1", "batch-2", "batch-1", "batch-unknown"])
+    
+    assert [result['progressId'] for result in results] == ["batch-1", "batch-2", "batch-unknown"]
+    assert all(result['success'] for result in results)
+    assert all(task.cancelled() for task in crawl_tasks.values())
+    assert not knowledge_api.active_crawl_tasks
+    
+    # Only the watched room is notified, once per event, just like a single stop
+    emitted = [(call.args[0], call.kwargs['room']) for call in fake_sio.emit.await_args_list]
+    assert emitted == [('crawl:stopping', 'batch-1'), ('crawl:stopped', 'batch-1')]
+    fake_sio.close_room.assert_awaited_once_with('batch-1')
+
+
+def test_stop_crawls_endpoint(client):
+    """Test the batch stop endpoint returns one result per progress id."""
+    response = client.post("/api/knowledge-items/stop", json={"progress_ids": ["unknown-1", "unknown-2"]})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data['success'] is True
+    assert [result['progressId'] for result in data['results']] == ["unknown-1", "unknown-2"]
@@ -8,6 +8,7 @@ from dspy.datasets import HotPotQA
 from dspy.teleprompt import BootstrapFewShot
 from dspy.evaluate import Evaluate
 import os
+import re
 from dotenv import load_dotenv
 from anthropic import Anthropic
 
@@ -23,7 +24,9 @@ print("=" * 80)
 
 # Step 1: Configure the language model
 print("\n[1/6] Configuring language model...")
-lm = dspy.LM("anthropic/claude-haiku-4-5-20251001")
+# cache=True: identical prompts (e.g. the baseline re-run on devset examples for the
+# side-by-side comparison, or repeat runs of this script) are served without re-hitting Anthropic
+lm = dspy.LM("anthropic/claude-haiku-4-5-20251001", cache=True)
 dspy.configure(lm=lm)
 print("[OK] Using Claude 4.5 Haiku")
 
@@ -33,7 +36,7 @@ dataset = HotPotQA(
     train_seed=1,
     train_size=20,      # Small for quick demo
     eval_seed=2023,
-    dev_size=50,
+    dev_size=20,        # Only the first 20 dev examples are evaluated
     test_size=0
 )
 
@@ -96,6 +99,25 @@ print(f"\nBaseline Agent Answer: {result.answer}")
 print(f"Reasoning: {result.reasoning_steps[:200]}...")  # First 200 chars
 
 
+# Static pieces of the LLM-as-a-judge prompt, built once instead of per metric call
+_JUDGE_PREFIX = """You are evaluating whether a predicted answer matches the expected answer semantically.
+
+Expected Answer: """
+_JUDGE_MID = """
+Predicted Answer: """
+_JUDGE_SUFFIX = """
+
+Does the predicted answer convey the same meaning as the expected answer? Consider:
+- Semantic equivalence (not just exact word matching)
+- Both answers could be correct if they mean the same thing
+- Minor phrasing differences are okay
+
+Respond with ONLY "YES" or "NO"."""
+
+# Word tokens used by the judge-free shortcut in validate_answer
+_TOKEN_RE = re.compile(r"\w+")
+
+
 # Define validation metric using LLM-as-a-judge
 def validate_answer(example, pred, trace=None):
     """
@@ -105,18 +127,14 @@ def validate_answer(example, pred, trace=None):
     expected_answer = example.answer
     predicted_answer = pred.answer
 
-    # Simple LLM-as-a-judge prompt
-    judge_prompt = f"""You are evaluating whether a predicted answer matches the expected answer semantically.
-
-Expected Answer: {expected_answer}
-Predicted Answer: {predicted_answer}
-
-Does the predicted answer convey the same meaning as the expected answer? Consider:
-- Semantic equivalence (not just exact word matching)
-- Both answers could be correct if they mean the same thing
-- Minor phrasing differences are okay
+    # Skip the judge call only when the prediction is the expected answer token for token;
+    # containment ("not 1990" for "1990") is left to the judge
+    expected_tokens = _TOKEN_RE.findall(str(expected_answer).lower())
+    if expected_tokens and expected_tokens == _TOKEN_RE.findall(str(predicted_answer).lower()):
+        return True
 
-Respond with ONLY "YES" or "NO"."""
+    # Simple LLM-as-a-judge prompt
+    judge_prompt = "".join((_JUDGE_PREFIX, str(expected_answer), _JUDGE_MID, str(predicted_answer), _JUDGE_SUFFIX))
 
     try:
         response = judge_client.messages.create(
@@ -142,9 +160,9 @@ print("\nUsing LLM-as-a-judge (Claude 4.5 Haiku) for accurate semantic evaluatio
 
 # Evaluate baseline
 evaluator = Evaluate(
-    devset=devset[:20],  # Use first 20 for quick evaluation
+    devset=devset,  # 20 examples for quick evaluation
     metric=validate_answer,
-    num_threads=1,
+    num_threads=8,  # Judge calls run concurrently (the Anthropic client is thread-safe)
     display_progress=True,
     display_table=0  # Don't show full table
 )
@@ -257,7 +275,7 @@ if improvement <= 0:
     print("   - Hard to improve on strong zero-shot performance")
 
     print("\n3. STATISTICAL VARIATION:")
-    print(f"   - Only {len(devset[:20])} test examples evaluated")
+    print(f"   - Only {len(devset)} test examples evaluated")
     print("   - Small sample = high variance")
     print("   - Need larger eval set for reliable comparison")
 
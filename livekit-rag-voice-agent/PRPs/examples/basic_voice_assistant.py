@@ -15,12 +15,36 @@ from livekit.plugins import (
     noise_cancellation,
 )
 import aiohttp
+import ast
+import asyncio
 import json
 from datetime import datetime
+from functools import lru_cache
 
 # Load environment variables from .env file
 load_dotenv(".env")
 
+# Mock weather data - replace with actual weather API
+# Example providers: OpenWeatherMap, WeatherAPI, etc.
+_MOCK_WEATHER = {
+    "temperature": "72°F",
+    "condition": "Partly cloudy",
+    "humidity": "65%",
+    "wind": "5 mph"
+}
+
+# Weather reply with the mock data filled in once; only the location varies per call
+_WEATHER_TEMPLATE = "Weather in {{location}}: {condition}, {temperature}".format_map(_MOCK_WEATHER)
+
+# Characters accepted by the calculate tool
+_ALLOWED_EXPRESSION_CHARS = frozenset("0123456789+-*/()., ")
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Parse and compile a math expression once; repeated expressions reuse the code object."""
+    return compile(ast.parse(expression, mode="eval"), "<calculate>", "eval")
+
 
 class BasicAssistant(Agent):
     """A helpful voice AI assistant with basic capabilities."""
@@ -47,16 +71,8 @@ class BasicAssistant(Agent):
         Args:
             location: City name or location (e.g., "New York", "London")
         """
-        # This is a mock implementation - replace with actual weather API
-        # Example providers: OpenWeatherMap, WeatherAPI, etc.
-        weather_data = {
-            "temperature": "72°F",
-            "condition": "Partly cloudy",
-            "humidity": "65%",
-            "wind": "5 mph"
-        }
-        
-        return f"Weather in {location}: {weather_data['condition']}, {weather_data['temperature']}"
+        # This is a mock implementation - see _MOCK_WEATHER above
+        return _WEATHER_TEMPLATE.format(location=location)
     
     @function_tool
     async def calculate(self, context: RunContext, expression: str) -> str:
@@ -69,9 +85,8 @@ class BasicAssistant(Agent):
         try:
             # Safe evaluation of mathematical expressions
             # In production, use a proper math parser library
-            allowed_chars = "0123456789+-*/()., "
-            if all(c in allowed_chars for c in expression):
-                result = eval(expression)
+            if _ALLOWED_EXPRESSION_CHARS.issuperset(expression):
+                result = eval(_compile_expression(expression), {"__builtins__": {}})
                 return f"The result of {expression} is {result}"
             else:
                 return "I can only handle basic mathematical operations"
@@ -99,28 +114,36 @@ class BasicAssistant(Agent):
 async def entrypoint(ctx: agents.JobContext):
     """Main entry point for the agent worker."""
     
+    # Submit the Silero VAD load to a worker thread now, so it runs while the
+    # (synchronous) plugin constructors below build the rest of the session
+    vad_future = asyncio.get_running_loop().run_in_executor(None, silero.VAD.load)
+    
+    # Speech-to-Text configuration
+    stt = deepgram.STT(
+        model="nova-2",  # Best general model
+        language="en",    # Set to "multi" for multilingual support
+    )
+    
+    # Large Language Model configuration
+    llm = openai.LLM(
+        model="gpt-4.1-mini",  # Fast and cost-effective
+        temperature=0.7,      # Balance between creativity and consistency
+    )
+    
+    # Text-to-Speech configuration
+    tts = openai.TTS(
+        voice="echo",  # Natural sounding voice
+        speed=1.0,     # Normal speaking speed
+    )
+    
     # Configure the voice pipeline
     session = AgentSession(
-        # Speech-to-Text configuration
-        stt=deepgram.STT(
-            model="nova-2",  # Best general model
-            language="en",    # Set to "multi" for multilingual support
-        ),
-        
-        # Large Language Model configuration
-        llm=openai.LLM(
-            model="gpt-4.1-mini",  # Fast and cost-effective
-            temperature=0.7,      # Balance between creativity and consistency
-        ),
-        
-        # Text-to-Speech configuration
-        tts=openai.TTS(
-            voice="echo",  # Natural sounding voice
-            speed=1.0,     # Normal speaking speed
-        ),
+        stt=stt,
+        llm=llm,
+        tts=tts,
         
         # Voice Activity Detection
-        vad=silero.VAD.load(),
+        vad=await vad_future,
         
         # Turn detection strategy
         turn_detection="semantic",  # Best for natural conversation
@@ -8,6 +8,10 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import json
+import hashlib
+import sqlite3
+import threading
+from array import array
 
 from openai import RateLimitError, APIError
 from dotenv import load_dotenv
@@ -291,6 +295,45 @@ class EmbeddingGenerator:
         """
         return await self.generate_embedding(query)
     
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several search queries in one request.
+        
+        Unlike generate_embeddings_batch, failures are raised rather than
+        replaced with zero vectors, so a search never runs on a bogus query.
+        
+        Args:
+            queries: Search queries
+        
+        Returns:
+            Query embeddings, in the order of queries
+        """
+        limit = self.config["max_tokens"] * 4
+        texts = [query[:limit] for query in queries]
+        
+        for attempt in range(self.max_retries):
+            try:
+                response = await embedding_client.embeddings.create(
+                    model=self.model,
+                    input=texts
+                )
+                
+                return [data.embedding for data in response.data]
+                
+            except RateLimitError:
+                if attempt == self.max_retries - 1:
+                    raise
+                
+                delay = self.retry_delay * (2 ** attempt)
+                logger.warning(f"Rate limit hit, retrying queries in {delay}s")
+                await asyncio.sleep(delay)
+                
+            except Exception as e:
+                logger.error(f"Failed to embed queries: {e}")
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(self.retry_delay)
+    
     def get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings for this model."""
         return self.config["dimensions"]
@@ -333,10 +376,71 @@ class EmbeddingCache:
         return hashlib.md5(text.encode()).hexdigest()
 
 
+class PersistentEmbeddingCache:
+    """Content-addressed on-disk embedding cache shared across sessions."""
+    
+    def __init__(self, path: str, model: str = EMBEDDING_MODEL, max_size: int = 50000):
+        """Open (or create) the SQLite store at path, keeping at most max_size vectors."""
+        self.model = model
+        self.max_size = max_size
+        # Calls arrive from worker threads via asyncio.to_thread
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL with NORMAL sync skips the per-commit fsync of the default rollback journal
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._size = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Get embeddings from disk, None for texts that are not stored."""
+        results = []
+        with self._lock:
+            for text in texts:
+                row = self.conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (self._key(text),)
+                ).fetchone()
+                results.append(array('f', row[0]).tolist() if row else None)
+        return results
+    
+    def put_many(self, items: List[Tuple[str, List[float]]]):
+        """Store embeddings as packed float32 bytes in one commit, evicting the oldest rows."""
+        with self._lock:
+            for text, embedding in items:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (self._key(text), array('f', embedding).tobytes())
+                )
+                self._size += cursor.rowcount
+            if self._size > self.max_size:
+                self.conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                    (self._size - self.max_size,)
+                )
+                self._size = self.max_size
+            self.conn.commit()
+    
+    async def aget_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """get_many on a worker thread, keeping SQLite I/O off the event loop."""
+        return await asyncio.to_thread(self.get_many, texts)
+    
+    async def aput_many(self, items: List[Tuple[str, List[float]]]):
+        """put_many on a worker thread, keeping SQLite I/O off the event loop."""
+        await asyncio.to_thread(self.put_many, items)
+    
+    def _key(self, text: str) -> str:
+        """Hash model and text together so a model change never returns stale vectors."""
+        return hashlib.blake2b(f"{self.model}:{text}".encode()).hexdigest()
+
+
 # Factory function
 def create_embedder(
     model: str = EMBEDDING_MODEL,
     use_cache: bool = True,
+    persistent_cache: Optional[str] = None,
     **kwargs
 ) -> EmbeddingGenerator:
     """
@@ -345,6 +449,7 @@ def create_embedder(
     Args:
         model: Embedding model to use
         use_cache: Whether to use caching
+        persistent_cache: Optional SQLite path for an on-disk cache behind the in-memory one
         **kwargs: Additional arguments for EmbeddingGenerator
     
     Returns:
@@ -355,6 +460,7 @@ def create_embedder(
     if use_cache:
         # Add caching capability
         cache = EmbeddingCache()
+        disk_cache = PersistentEmbeddingCache(persistent_cache, model) if persistent_cache else None
         original_generate = embedder.generate_embedding
         
         async def cached_generate(text: str) -> List[float]:
@@ -362,11 +468,46 @@ def create_embedder(
             if cached is not None:
                 return cached
             
+            if disk_cache:
+                cached = (await disk_cache.aget_many([text]))[0]
+                if cached is not None:
+                    cache.put(text, cached)
+                    return cached
+            
             embedding = await original_generate(text)
             cache.put(text, embedding)
+            if disk_cache:
+                await disk_cache.aput_many([(text, embedding)])
             return embedding
         
+        original_embed_queries = embedder.embed_queries
+        
+        async def cached_embed_queries(queries: List[str]) -> List[List[float]]:
+            results = [cache.get(query) for query in queries]
+            
+            if disk_cache and None in results:
+                missing = [query for query, result in zip(queries, results) if result is None]
+                stored = dict(zip(missing, await disk_cache.aget_many(missing)))
+                for i, query in enumerate(queries):
+                    if results[i] is None and stored.get(query) is not None:
+                        results[i] = stored[query]
+                        cache.put(query, results[i])
+            
+            missing = list(dict.fromkeys(
+                query for query, result in zip(queries, results) if result is None
+            ))
+            if missing:
+                embedded = dict(zip(missing, await original_embed_queries(missing)))
+                for query, embedding in embedded.items():
+                    cache.put(query, embedding)
+                if disk_cache:
+                    await disk_cache.aput_many(list(embedded.items()))
+                results = [embedded.get(query) if result is None else result
+                           for query, result in zip(queries, results)]
+            return results
+        
         embedder.generate_embedding = cached_generate
+        embedder.embed_queries = cached_embed_queries
     
     return embedder
 
@@ -25,25 +25,164 @@ from livekit.agents import (
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 from livekit.agents.llm import function_tool
 from livekit.plugins import openai, deepgram, silero, turn_detector
+import asyncio
 import asyncpg
 import json
 import os
-from typing import List, Dict, Any
+import struct
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import numpy as np
 
+from ingestion.embedder import create_embedder
+
 # Load environment variables
 load_dotenv(".env")
 
 logger = logging.getLogger(__name__)
 
+# Shared embedder, created on first search and reused across calls
+_EMBEDDER = None
+# Optional on-disk embedding cache, only enabled when EMBED_CACHE_PATH is set
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH") or None
+
+# Concurrent query embeddings are coalesced into one API call per window
+EMBED_BATCH_WINDOW = 0.01
+EMBED_BATCH_MAX = 32
+_embed_queue: Optional[asyncio.Queue] = None
+_batcher_task: Optional[asyncio.Task] = None
+
+# ASR fragments that are not worth an embedding and a vector search (short acronyms like "SQL" still are)
+MIN_QUERY_LENGTH = 2
+FILLER_QUERIES = frozenset({"ok", "okay", "yes", "no", "thanks", "what", "uh", "um", "hmm"})
+
+# Seconds to wait for pooled connections to close gracefully on exit
+DB_CLOSE_TIMEOUT = 2.0
+
+# Relevance cut-offs: rows below MIN_SIMILARITY are pruned in SQL, and a top
+# match below LOW_CONFIDENCE_SIMILARITY is reported as a weak hit
+MIN_SIMILARITY = 0.5
+LOW_CONFIDENCE_SIMILARITY = 0.6
+
+# Constant statement text so asyncpg's per-connection statement cache
+# reuses one prepared statement instead of re-parsing on every search
+# Columns are pinned to (similarity, content, document_title) for positional reads
+MATCH_CHUNKS_SQL = """
+    SELECT similarity, content, document_title FROM match_chunks($1, $2)
+    WHERE similarity >= $3
+    ORDER BY similarity DESC
+"""
+
+# Most recent searches kept per session
+SEARCH_HISTORY_SIZE = 256
+
+# Query cache settings for search_knowledge_base
+QUERY_CACHE_SIZE = 128
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+
+def _get_embedder():
+    """Return the shared embedder, creating it on first use."""
+    global _EMBEDDER
+    if _EMBEDDER is None:
+        _EMBEDDER = create_embedder(persistent_cache=EMBED_CACHE_PATH)
+    return _EMBEDDER
+
+
+async def _batcher(queue: asyncio.Queue) -> None:
+    """Drain queued queries every window and embed them with a single request."""
+    while True:
+        batch = [await queue.get()]
+        try:
+            await asyncio.sleep(EMBED_BATCH_WINDOW)
+            while len(batch) < EMBED_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            embedder = _get_embedder()
+            queries = [query for query, _ in batch]
+            if len(batch) == 1:
+                embeddings = [await embedder.embed_query(queries[0])]
+            else:
+                # Cache-aware batch call that raises instead of zero-filling failures
+                embeddings = await embedder.embed_queries(queries)
+            if len(embeddings) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} query embeddings, got {len(embeddings)}")
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Never leave a caller waiting, even if the batcher itself is cancelled
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+
+async def _embed_batched(query: str) -> List[float]:
+    """Queue a query for the batcher and wait for its embedding."""
+    global _embed_queue, _batcher_task
+    loop = asyncio.get_running_loop()
+    if _batcher_task is None or _batcher_task.done() or _batcher_task.get_loop() is not loop:
+        _embed_queue = asyncio.Queue()
+        _batcher_task = asyncio.create_task(_batcher(_embed_queue))
+    
+    future = loop.create_future()
+    await _embed_queue.put((query, future))
+    return await future
+
+
+def _encode_vector(value) -> bytes:
+    """Encode an embedding in pgvector's binary format (dim, unused, float4 values)."""
+    vector = np.asarray(value, dtype='>f4')
+    return struct.pack('>HH', vector.shape[0], 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> np.ndarray:
+    """Decode pgvector's binary format into a float32 array."""
+    dim, _ = struct.unpack_from('>HH', data)
+    return np.frombuffer(data, dtype='>f4', count=dim, offset=4).astype(np.float32)
+
+
+def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric int8 scalar quantization; returns the codes and their scale."""
+    scale = float(np.abs(vector).max()) / 127
+    if not scale:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    codes = np.round(vector / scale).clip(-127, 127).astype(np.int8)
+    return codes, scale
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Register the binary pgvector codec on each pooled connection."""
+    await conn.set_type_codec(
+        'vector',
+        encoder=_encode_vector,
+        decoder=_decode_vector,
+        schema='public',
+        format='binary'
+    )
+
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Build the shared embedder before the first job so searches never construct it
+    _get_embedder()
 
 class RAGKnowledgeAgent(Agent):
     """Voice AI agent with RAG knowledge base access."""
     
+    GREETING_INSTRUCTIONS = """Greet the user warmly and let them know you can help them:
+            - Search through the organization's knowledge base
+            - Answer questions about documented topics
+            - Find specific information from internal documents
+            Keep it brief, natural, and professional."""
+    FAREWELL = "Thank you for using the knowledge assistant. Have a great day!"
+    
     def __init__(self) -> None:
         super().__init__(
             instructions="""You are an intelligent knowledge assistant with access to an organization's documentation and information.
@@ -56,18 +195,70 @@ class RAGKnowledgeAgent(Agent):
             When you find relevant information, synthesize it clearly and cite the source documents."""
         )
         self.db_pool = None
-        self.search_history = []
+        self.search_history = deque(maxlen=SEARCH_HISTORY_SIZE)
+        # (normalized query, limit) -> (response, results_count, top_similarity), LRU ordered
+        self._exact_cache: "OrderedDict[Tuple[str, int], Tuple[str, int, float]]" = OrderedDict()
+        # (int8 unit-length query embedding, scale, cache key) rows for paraphrase hits
+        self._sem_cache: List[Tuple[np.ndarray, float, Tuple[str, int]]] = []
+        # Stacked int32 codes, scales and limits of _sem_cache, rebuilt lazily after changes
+        self._sem_matrix: Optional[np.ndarray] = None
+        self._sem_scales: Optional[np.ndarray] = None
+        self._sem_limits: Optional[np.ndarray] = None
         
     async def initialize_db(self):
         """Initialize database connection pool."""
         if not self.db_pool:
             self.db_pool = await asyncpg.create_pool(
                 os.getenv("DATABASE_URL"),
-                min_size=2,
-                max_size=10,
-                command_timeout=60
+                min_size=1,
+                max_size=8,
+                command_timeout=10,
+                max_inactive_connection_lifetime=300,
+                init=_init_connection
             )
     
+    def _semantic_lookup(self, query_vector: np.ndarray, limit: int) -> Optional[Tuple[str, int]]:
+        """Return the cache key of the closest cached query with the same limit above the threshold."""
+        norm = np.linalg.norm(query_vector)
+        if not self._sem_cache or not norm:
+            return None
+        if self._sem_matrix is None:
+            # int32 accumulation avoids int8 overflow in the dot products
+            self._sem_matrix = np.stack([codes for codes, _, _ in self._sem_cache]).astype(np.int32)
+            self._sem_scales = np.array([scale for _, scale, _ in self._sem_cache], dtype=np.float32)
+            self._sem_limits = np.array([key[1] for _, _, key in self._sem_cache])
+        query_codes, query_scale = _quantize(query_vector / norm)
+        cos = (self._sem_matrix @ query_codes.astype(np.int32)) * self._sem_scales * query_scale
+        # Answers cached for a different limit carry the wrong number of results
+        cos = np.where(self._sem_limits == limit, cos, -np.inf)
+        best = int(np.argmax(cos))
+        if cos[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return self._sem_cache[best][2]
+        return None
+    
+    def _cache_store(self, key: Tuple[str, int], query_vector: np.ndarray, entry: Tuple[str, int, float]) -> None:
+        """Insert a search result into both cache tiers, evicting the oldest entries."""
+        self._exact_cache[key] = entry
+        self._exact_cache.move_to_end(key)
+        norm = np.linalg.norm(query_vector)
+        if norm:
+            self._sem_cache.append((*_quantize(query_vector / norm), key))
+            self._sem_matrix = None
+        while len(self._exact_cache) > QUERY_CACHE_SIZE:
+            evicted, _ = self._exact_cache.popitem(last=False)
+            self._sem_cache = [row for row in self._sem_cache if row[2] != evicted]
+            self._sem_matrix = None
+    
+    def _cached_response(self, query: str, cached: Tuple[str, int, float]) -> str:
+        """Record a cache hit in the search history and return its response."""
+        response, results_count, top_similarity = cached
+        self.search_history.append({
+            "query": query,
+            "results_count": results_count,
+            "top_similarity": top_similarity
+        })
+        return response
+    
     @function_tool
     async def search_knowledge_base(
         self, 
@@ -83,55 +274,68 @@ class RAGKnowledgeAgent(Agent):
             limit: Maximum number of results to return (default: 5)
         """
         try:
-            # Ensure database is initialized
-            if not self.db_pool:
-                await self.initialize_db()
+            # Exact-match cache on the normalized query and result limit
+            normalized = query.strip().lower()
+            if (len(normalized) < MIN_QUERY_LENGTH or normalized in FILLER_QUERIES
+                    or not any(char.isalnum() for char in normalized)):
+                return "Could you clarify what you'd like me to look up?"
+            
+            cache_key = (normalized, limit)
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+                return self._cached_response(query, cached)
             
             # Generate embedding for query
-            from ingestion.embedder import create_embedder
-            embedder = create_embedder()
-            query_embedding = await embedder.embed_query(query)
+            query_vector = np.asarray(await _embed_batched(query), dtype=np.float32)
             
-            # Convert to PostgreSQL vector format
-            embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+            # Semantic cache catches paraphrases of recent questions without touching the pool
+            similar_key = self._semantic_lookup(query_vector, limit)
+            if similar_key is not None:
+                self._exact_cache.move_to_end(similar_key)
+                return self._cached_response(query, self._exact_cache[similar_key])
+            
+            # Ensure database is initialized
+            if not self.db_pool:
+                await self.initialize_db()
             
-            # Search using match_chunks function
             async with self.db_pool.acquire() as conn:
+                # Search using match_chunks function
                 results = await conn.fetch(
-                    """
-                    SELECT * FROM match_chunks($1::vector, $2)
-                    """,
-                    embedding_str,
-                    limit
+                    MATCH_CHUNKS_SQL,
+                    query_vector,
+                    limit,
+                    MIN_SIMILARITY
                 )
 
             # Format results for response
             if not results:
                 return "No relevant information found in the knowledge base for your query."
             
-            # Build response with sources
-            response_parts = []
-            for i, row in enumerate(results, 1):
-                similarity = row['similarity']
-                content = row['content']
-                doc_title = row['document_title']
-                doc_source = row['document_source']
-                
-                response_parts.append(
-                    f"[Source: {doc_title}]\n{content}\n"
-                )
-            
-            if not response_parts:
+            top_similarity = results[0][0]
+            if top_similarity < LOW_CONFIDENCE_SIMILARITY:
                 return "Found some results but they may not be directly relevant to your query. Please try rephrasing your question."
             
+            # Build response with sources
+            response_parts = [
+                f"[Source: {doc_title}]\n{content}\n"
+                for _, content, doc_title in results
+            ]
+            
             # Track search history
             self.search_history.append({
                 "query": query,
                 "results_count": len(response_parts),
-                "top_similarity": results[0]['similarity'] if results else 0
+                "top_similarity": top_similarity
             })
             
-            return f"Found {len(response_parts)} relevant results:\n\n" + "\n---\n".join(response_parts)
+            response = f"Found {len(response_parts)} relevant results:\n\n" + "\n---\n".join(response_parts)
+            self._cache_store(
+                cache_key,
+                query_vector,
+                (response, len(response_parts), top_similarity)
+            )
+            return response
             
         except Exception as e:
             logger.error(f"Knowledge base search failed: {e}")
@@ -143,22 +347,25 @@ class RAGKnowledgeAgent(Agent):
         await self.initialize_db()
         
         # Generate greeting
-        await self.session.generate_reply(
-            instructions="""Greet the user warmly and let them know you can help them:
-            - Search through the organization's knowledge base
-            - Answer questions about documented topics
-            - Find specific information from internal documents
-            Keep it brief, natural, and professional."""
-        )
+        await self.session.generate_reply(instructions=self.GREETING_INSTRUCTIONS)
     
     async def on_exit(self) -> None:
         """Called when agent is being replaced or session ends."""
-        # Close database pool
+        # Farewell message plays while the database pool shuts down
+        farewell = self.session.say(self.FAREWELL)
         if self.db_pool:
-            await self.db_pool.close()
-        
-        # Farewell message
-        await self.session.say("Thank you for using the knowledge assistant. Have a great day!")
+            await asyncio.gather(farewell, self._close_db_pool())
+        else:
+            await farewell
+    
+    async def _close_db_pool(self) -> None:
+        """Close the pool gracefully, terminating connections that take too long."""
+        pool, self.db_pool = self.db_pool, None
+        try:
+            await asyncio.wait_for(pool.close(), timeout=DB_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Database pool close timed out, terminating connections")
+            pool.terminate()
 
 
 async def entrypoint(ctx: agents.JobContext):
@@ -185,7 +392,7 @@ async def entrypoint(ctx: agents.JobContext):
         ),
         
         # Voice Activity Detection
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
         
         # Turn detection - semantic for natural flow
         turn_detection=MultilingualModel(),
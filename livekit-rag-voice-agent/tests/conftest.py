@@ -0,0 +1,91 @@
+"""
+Shared fixtures for RAG Voice Agent tests
+"""
+
+import random
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+
+
+class FakeConnection:
+    """Connection stand-in that returns canned match_chunks rows."""
+    
+    def __init__(self):
+        self.rows = []
+        self.fetch_calls = 0
+    
+    async def fetch(self, query, *args):
+        self.fetch_calls += 1
+        return self.rows
+
+
+class FakePool:
+    """Pool stand-in handing out a single shared connection."""
+    
+    def __init__(self):
+        self.conn = FakeConnection()
+        self.close_calls = 0
+    
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+    
+    async def close(self):
+        self.close_calls += 1
+    
+    def terminate(self):
+        pass
+
+
+class FakeEmbedder:
+    """Embedder stand-in returning a deterministic per-query embedding."""
+    
+    def __init__(self):
+        self.embed_calls = 0
+        # Paraphrase -> original query, so both embed to the same vector
+        self.aliases = {}
+        # Set to an exception to make every embedding call fail
+        self.error = None
+    
+    def _vector(self, query):
+        rng = random.Random(self.aliases.get(query, query))
+        return [rng.gauss(0, 1) for _ in range(1536)]
+    
+    async def embed_query(self, query):
+        self.embed_calls += 1
+        if self.error:
+            raise self.error
+        return self._vector(query)
+    
+    async def embed_queries(self, queries):
+        self.embed_calls += len(queries)
+        if self.error:
+            raise self.error
+        return [self._vector(query) for query in queries]
+
+
+@pytest.fixture(autouse=True)
+def reset_embedder():
+    """Drop the cached module-level embedder so each test's patched factory is used."""
+    rag_agent = sys.modules.get('rag_agent')
+    if rag_agent is not None:
+        rag_agent._EMBEDDER = None
+    yield
+    if rag_agent is not None:
+        rag_agent._EMBEDDER = None
+
+
+@pytest.fixture
+def fake_pool():
+    """In-memory database pool; set fake_pool.conn.rows to control results."""
+    return FakePool()
+
+
+@pytest.fixture
+def fake_embedder(monkeypatch):
+    """Route rag_agent's embedder factory to a FakeEmbedder."""
+    embedder = FakeEmbedder()
+    monkeypatch.setattr(sys.modules['rag_agent'], 'create_embedder', lambda **kwargs: embedder)
+    return embedder
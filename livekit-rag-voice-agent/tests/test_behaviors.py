@@ -82,12 +82,11 @@ class MockAgentTestSuite:
                 mock_pool.return_value.acquire.return_value = mock_acquire
                 
                 mock_conn.fetch.return_value = [
-                    {
-                        'similarity': 0.85,
-                        'content': 'AI strategy content',
-                        'document_title': 'Company AI Strategy',
-                        'document_source': 'strategy.md'
-                    }
+                    (
+                        0.85,
+                        'AI strategy content',
+                        'Company AI Strategy'
+                    )
                 ]
                 
                 agent.db_pool = mock_pool.return_value
@@ -180,119 +179,62 @@ async def test_error_handling_behavior():
 
 
 @pytest.mark.asyncio
-async def test_no_results_behavior():
+async def test_no_results_behavior(fake_pool, fake_embedder):
     """Test agent behavior when no relevant results found."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
     context = Mock()
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        mock_conn.fetch.return_value = []  # No results
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            result = await agent.search_knowledge_base(context, "completely unknown topic")
-            
-            # Should inform user politely that no information was found
-            assert "No relevant information found" in result
-            assert "knowledge base" in result
+    result = await agent.search_knowledge_base(context, "completely unknown topic")
+    
+    # Should inform user politely that no information was found
+    assert "No relevant information found" in result
+    assert "knowledge base" in result
 
 
 @pytest.mark.asyncio
-async def test_low_confidence_behavior():
+async def test_low_confidence_behavior(fake_pool, fake_embedder):
     """Test agent behavior with low confidence results."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
     context = Mock()
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        
-        # Results with low similarity
-        mock_conn.fetch.return_value = [
-            {
-                'similarity': 0.4,  # Very low similarity
-                'content': 'Barely related content',
-                'document_title': 'Some Document',
-                'document_source': 'doc.md'
-            }
-        ]
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            result = await agent.search_knowledge_base(context, "vague question")
-            
-            # Should indicate low relevance
-            assert "may not be directly relevant" in result or "rephrase" in result.lower()
+    # Results with low similarity
+    fake_pool.conn.rows = [
+        (0.4, 'Barely related content', 'Some Document'),  # Very low similarity
+    ]
+    
+    result = await agent.search_knowledge_base(context, "vague question")
+    
+    # Should indicate low relevance
+    assert "may not be directly relevant" in result or "rephrase" in result.lower()
 
 
 @pytest.mark.asyncio
-async def test_multiple_sources_behavior():
+async def test_multiple_sources_behavior(fake_pool, fake_embedder):
     """Test agent properly cites multiple sources."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
     context = Mock()
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        
-        # Multiple high-quality results
-        mock_conn.fetch.return_value = [
-            {
-                'similarity': 0.95,
-                'content': 'Primary information about topic',
-                'document_title': 'Main Guide',
-                'document_source': 'guide.md'
-            },
-            {
-                'similarity': 0.88,
-                'content': 'Supporting information',
-                'document_title': 'Reference Doc',
-                'document_source': 'ref.md'
-            },
-            {
-                'similarity': 0.82,
-                'content': 'Additional context',
-                'document_title': 'FAQ',
-                'document_source': 'faq.md'
-            }
-        ]
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            result = await agent.search_knowledge_base(context, "comprehensive question")
-            
-            # Should include multiple sources
-            assert "Found 3 relevant results" in result
-            assert "[Source: Main Guide]" in result
-            assert "[Source: Reference Doc]" in result
-            assert "[Source: FAQ]" in result
+    # Multiple high-quality results
+    fake_pool.conn.rows = [
+        (0.95, 'Primary information about topic', 'Main Guide'),
+        (0.88, 'Supporting information', 'Reference Doc'),
+        (0.82, 'Additional context', 'FAQ'),
+    ]
+    
+    result = await agent.search_knowledge_base(context, "comprehensive question")
+    
+    # Should include multiple sources
+    assert "Found 3 relevant results" in result
+    assert "[Source: Main Guide]" in result
+    assert "[Source: Reference Doc]" in result
+    assert "[Source: FAQ]" in result
 
 
 @pytest.mark.asyncio
-async def test_session_lifecycle():
+async def test_session_lifecycle(fake_pool):
     """Test complete session lifecycle from greeting to farewell."""
     agent = RAGKnowledgeAgent()
     
@@ -317,11 +259,11 @@ async def test_session_lifecycle():
     ]
     
     # Test exit
-    agent.db_pool = AsyncMock()
+    agent.db_pool = fake_pool
     await agent.on_exit()
     
     # Should close pool and say farewell
-    agent.db_pool.close.assert_called_once()
+    assert fake_pool.close_calls == 1
     agent.session.say.assert_called_once_with("Thank you for using the knowledge assistant. Have a great day!")
 
 
@@ -31,7 +31,7 @@ async def test_agent_initialization():
     agent = RAGKnowledgeAgent()
     assert "knowledge assistant" in agent.instructions.lower()
     assert agent.db_pool is None
-    assert agent.search_history == []
+    assert len(agent.search_history) == 0
 
 
 @pytest.mark.asyncio
@@ -49,128 +49,65 @@ async def test_database_initialization():
 
 
 @pytest.mark.asyncio
-async def test_search_knowledge_base_with_results():
+async def test_search_knowledge_base_with_results(fake_pool, fake_embedder):
     """Test knowledge base search returns relevant results."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.85, 'Test content about AI and machine learning', 'AI Documentation'),
+        (0.75, 'Machine learning algorithms and techniques', 'ML Guide'),
+    ]
     
-    # Mock database and embedder
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        
-        # Mock search results
-        mock_conn.fetch.return_value = [
-            {
-                'similarity': 0.85,
-                'content': 'Test content about AI and machine learning',
-                'document_title': 'AI Documentation',
-                'document_source': 'docs/ai.md'
-            },
-            {
-                'similarity': 0.75,
-                'content': 'Machine learning algorithms and techniques',
-                'document_title': 'ML Guide',
-                'document_source': 'docs/ml.md'
-            }
-        ]
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            # Execute search
-            context = Mock()
-            result = await agent.search_knowledge_base(context, "What is AI?", limit=5)
-            
-            assert "Found 2 relevant results" in result
-            assert "AI Documentation" in result
-            assert "ML Guide" in result
-            assert len(agent.search_history) == 1
-            assert agent.search_history[0]['query'] == "What is AI?"
-            assert agent.search_history[0]['results_count'] == 2
+    context = Mock()
+    result = await agent.search_knowledge_base(context, "What is AI?", limit=5)
+    
+    assert "Found 2 relevant results" in result
+    assert "AI Documentation" in result
+    assert "ML Guide" in result
+    assert len(agent.search_history) == 1
+    assert agent.search_history[0]['query'] == "What is AI?"
+    assert agent.search_history[0]['results_count'] == 2
 
 
 @pytest.mark.asyncio
-async def test_search_knowledge_base_no_results():
+async def test_search_knowledge_base_no_results(fake_pool, fake_embedder):
     """Test graceful handling when no results found."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        mock_conn.fetch.return_value = []
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            context = Mock()
-            result = await agent.search_knowledge_base(context, "Unknown topic")
-            
-            assert "No relevant information found" in result
+    context = Mock()
+    result = await agent.search_knowledge_base(context, "Unknown topic")
+    
+    assert "No relevant information found" in result
 
 
 @pytest.mark.asyncio
-async def test_search_knowledge_base_low_similarity():
+async def test_search_knowledge_base_low_similarity(fake_pool, fake_embedder):
     """Test handling of results with low similarity scores."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.5, 'Somewhat related content', 'Some Doc'),  # Below threshold
+    ]
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        
-        # Mock results with low similarity
-        mock_conn.fetch.return_value = [
-            {
-                'similarity': 0.5,  # Below threshold
-                'content': 'Somewhat related content',
-                'document_title': 'Some Doc',
-                'document_source': 'docs/some.md'
-            }
-        ]
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            context = Mock()
-            result = await agent.search_knowledge_base(context, "Vague query")
-            
-            assert "may not be directly relevant" in result
+    context = Mock()
+    result = await agent.search_knowledge_base(context, "Vague query")
+    
+    assert "may not be directly relevant" in result
 
 
 @pytest.mark.asyncio
-async def test_search_knowledge_base_error_handling():
+async def test_search_knowledge_base_error_handling(fake_embedder):
     """Test error handling in knowledge base search."""
     agent = RAGKnowledgeAgent()
     
     with patch('rag_agent.asyncpg.create_pool') as mock_pool:
         mock_pool.side_effect = Exception("Database connection failed")
         
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            context = Mock()
-            result = await agent.search_knowledge_base(context, "Test query")
-            
-            assert "encountered an error" in result
+        context = Mock()
+        result = await agent.search_knowledge_base(context, "Test query")
+        
+        assert "encountered an error" in result
 
 
 @pytest.mark.asyncio
@@ -190,66 +127,172 @@ async def test_on_enter_lifecycle():
 
 
 @pytest.mark.asyncio
-async def test_on_exit_lifecycle():
+async def test_on_exit_lifecycle(fake_pool):
     """Test on_exit lifecycle method."""
     agent = RAGKnowledgeAgent()
     
-    # Mock session and database pool
+    # Mock session; database pool is the in-memory fake
     agent.session = AsyncMock()
     agent.session.say = AsyncMock()
-    agent.db_pool = AsyncMock()
-    agent.db_pool.close = AsyncMock()
+    agent.db_pool = fake_pool
     
     await agent.on_exit()
     
-    agent.db_pool.close.assert_called_once()
+    assert fake_pool.close_calls == 1
+    assert agent.db_pool is None
     agent.session.say.assert_called_once_with("Thank you for using the knowledge assistant. Have a great day!")
 
 
 @pytest.mark.asyncio
-async def test_search_history_tracking():
+async def test_search_history_tracking(fake_pool, fake_embedder):
     """Test that search history is properly tracked."""
     agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.9, 'Result content', 'Doc'),
+    ]
     
-    with patch('rag_agent.asyncpg.create_pool') as mock_pool:
-        mock_conn = AsyncMock()
-        mock_acquire = AsyncMock()
-        mock_acquire.__aenter__.return_value = mock_conn
-        mock_pool.return_value.acquire.return_value = mock_acquire
-        
-        # Mock multiple searches
-        mock_conn.fetch.return_value = [
-            {
-                'similarity': 0.9,
-                'content': 'Result content',
-                'document_title': 'Doc',
-                'document_source': 'doc.md'
-            }
-        ]
-        
-        agent.db_pool = mock_pool.return_value
-        
-        with patch('rag_agent.create_embedder') as mock_embedder_factory:
-            mock_embedder = AsyncMock()
-            mock_embedder.embed_query = AsyncMock(return_value=[0.1] * 1536)
-            mock_embedder_factory.return_value = mock_embedder
-            
-            context = Mock()
-            
-            # Perform multiple searches
-            await agent.search_knowledge_base(context, "First query")
-            await agent.search_knowledge_base(context, "Second query")
-            await agent.search_knowledge_base(context, "Third query")
-            
-            assert len(agent.search_history) == 3
-            assert agent.search_history[0]['query'] == "First query"
-            assert agent.search_history[1]['query'] == "Second query"
-            assert agent.search_history[2]['query'] == "Third query"
-            
-            # Check that similarity scores are tracked
-            for history_item in agent.search_history:
-                assert 'top_similarity' in history_item
-                assert history_item['top_similarity'] == 0.9
+    context = Mock()
+    
+    # Perform multiple searches
+    await agent.search_knowledge_base(context, "First query")
+    await agent.search_knowledge_base(context, "Second query")
+    await agent.search_knowledge_base(context, "Third query")
+    
+    assert len(agent.search_history) == 3
+    assert agent.search_history[0]['query'] == "First query"
+    assert agent.search_history[1]['query'] == "Second query"
+    assert agent.search_history[2]['query'] == "Third query"
+    
+    # Check that similarity scores are tracked
+    for history_item in agent.search_history:
+        assert 'top_similarity' in history_item
+        assert history_item['top_similarity'] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_search_cache_skips_repeat_queries(fake_pool, fake_embedder):
+    """Test repeated and paraphrased queries are served from the query cache."""
+    agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.8, 'Cached content', 'Doc'),
+    ]
+    
+    fake_embedder.aliases["Explain RAG"] = "What is RAG?"
+    
+    context = Mock()
+    first = await agent.search_knowledge_base(context, "What is RAG?")
+    exact = await agent.search_knowledge_base(context, "  what is rag?  ")
+    paraphrase = await agent.search_knowledge_base(context, "Explain RAG")
+    
+    assert first == exact == paraphrase
+    assert fake_pool.conn.fetch_calls == 1
+    # Exact hit skips the embedding call entirely
+    assert fake_embedder.embed_calls == 2
+    assert len(agent.search_history) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_cache_respects_limit(fake_pool, fake_embedder):
+    """Test cached answers are only reused for the same result limit."""
+    agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.8, 'Cached content', 'Doc'),
+    ]
+    fake_embedder.aliases["Explain RAG"] = "What is RAG?"
+    
+    context = Mock()
+    await agent.search_knowledge_base(context, "What is RAG?", limit=5)
+    await agent.search_knowledge_base(context, "What is RAG?", limit=2)
+    await agent.search_knowledge_base(context, "Explain RAG", limit=3)
+    assert fake_pool.conn.fetch_calls == 3
+    
+    await agent.search_knowledge_base(context, "Explain RAG", limit=2)
+    assert fake_pool.conn.fetch_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_search_skips_filler_queries(fake_pool, fake_embedder):
+    """Test filler and too-short queries are answered without embedding or searching."""
+    agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    
+    context = Mock()
+    for query in ["ok", " Thanks ", "a", "hmm", "?!"]:
+        result = await agent.search_knowledge_base(context, query)
+        assert "clarify" in result
+    
+    assert fake_embedder.embed_calls == 0
+    assert fake_pool.conn.fetch_calls == 0
+    assert len(agent.search_history) == 0
+
+
+@pytest.mark.asyncio
+async def test_search_allows_short_acronyms(fake_pool, fake_embedder):
+    """Test short acronym queries are searched rather than treated as filler."""
+    agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    fake_pool.conn.rows = [
+        (0.9, 'Paid time off policy', 'HR Handbook'),
+    ]
+    
+    result = await agent.search_knowledge_base(Mock(), "PTO")
+    
+    assert "HR Handbook" in result
+    assert fake_pool.conn.fetch_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_reaches_every_caller(fake_pool, fake_embedder):
+    """Test a failed batch embedding fails all waiting queries instead of searching."""
+    import rag_agent
+    fake_embedder.error = RuntimeError("embedding API down")
+    
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            rag_agent._embed_batched("first question"),
+            rag_agent._embed_batched("second question"),
+            return_exceptions=True
+        ),
+        timeout=1
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    
+    agent = RAGKnowledgeAgent()
+    agent.db_pool = fake_pool
+    result = await agent.search_knowledge_base(Mock(), "What is RAG?")
+    assert "encountered an error" in result
+    assert fake_pool.conn.fetch_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_embedder_factory_failure_does_not_hang(monkeypatch):
+    """Test queued queries fail when the embedder cannot be created."""
+    import rag_agent
+    
+    def broken_factory(**kwargs):
+        raise RuntimeError("no API key")
+    
+    monkeypatch.setattr(rag_agent, 'create_embedder', broken_factory)
+    
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(rag_agent._embed_batched("What is RAG?"), timeout=1)
+
+
+def test_vector_codec_round_trip():
+    """Test the binary pgvector codec decodes what it encodes."""
+    import numpy as np
+    import rag_agent
+    
+    vector = [0.25, -1.5, 3.0, 0.0]
+    data = rag_agent._encode_vector(vector)
+    
+    assert len(data) == 4 + 4 * len(vector)
+    decoded = rag_agent._decode_vector(data)
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == vector
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""
+TTL response cache for external research API calls.
+
+Entries expire after a jittered TTL and the least recently used entry is
+evicted once the cache is full.
+"""
+
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+_CACHE_MAX_SIZE = 500
+
+
+class ResponseCache:
+    """In-memory LRU cache with per-entry expiry"""
+    
+    def __init__(self, max_size: int = _CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(model: str, query: str) -> str:
+        """Hash the model and whitespace/case-normalized query into a cache key"""
+        normalized = " ".join(query.lower().split())
+        payload = json.dumps({"model": model, "q": normalized}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached payload, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, payload = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return payload
+    
+    def set(self, key: str, payload: Any, ttl: int) -> None:
+        """Store a payload; the TTL is jittered by up to a minute to avoid stampedes"""
+        self._entries[key] = (time.monotonic() + ttl + random.randint(-60, 60), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
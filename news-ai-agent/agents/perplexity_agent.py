@@ -5,16 +5,62 @@ This agent performs web research using Perplexity's Sonar API to gather
 the latest AI news developments with real-time citations.
 """
 
+import asyncio
 import logging
 import httpx
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from pydantic_ai import Agent, RunContext
 
 from clients import get_model
 from .deps import NewsResearchAgentDependencies
+from ._cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+
+# Per-phase request deadlines enforced by httpx itself, no wrapper tasks
+_PPLX_TIMEOUT = httpx.Timeout(connect=5.0, read=25.0, write=10.0, pool=2.0)
+
+# Shared client so Perplexity calls reuse pooled keep-alive connections
+_PPLX_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_perplexity_client() -> httpx.AsyncClient:
+    """Get the shared Perplexity HTTP client, creating it on first use"""
+    global _PPLX_CLIENT
+    if _PPLX_CLIENT is None or _PPLX_CLIENT.is_closed:
+        _PPLX_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=_PPLX_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
+    return _PPLX_CLIENT
+
+
+async def close_perplexity_client() -> None:
+    """Close the shared Perplexity HTTP client"""
+    global _PPLX_CLIENT
+    if _PPLX_CLIENT is not None:
+        await _PPLX_CLIENT.aclose()
+        _PPLX_CLIENT = None
+
+
+# AI news responses keyed by normalized query; topics repeat across runs
+_NEWS_CACHE_TTL = 900
+_news_cache = ResponseCache()
+_inflight: Dict[str, "asyncio.Future[str]"] = {}
+
+
+@lru_cache(maxsize=8)
+def _perplexity_headers(api_key: str) -> Dict[str, str]:
+    """Build the request headers once per API key"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
 PERPLEXITY_RESEARCH_PROMPT = """
 You are a specialized AI news research agent using Perplexity's real-time web search capabilities.
 
@@ -33,6 +79,7 @@ For each search query, you should:
 - Focus on credible sources (research institutions, major tech companies, reputable news outlets)
 - Identify key trends and developments
 - Provide clear, factual summaries
+- Send several independent queries together with search_perplexity_batch so they run in parallel
 
 Return your findings as structured information including:
 - Title of each news item
@@ -52,6 +99,55 @@ perplexity_agent = Agent(
     instrument=True
 )
 
+async def _fetch_ai_news(api_key: str, query: str, cache_key: str) -> str:
+    """POST an AI news query to Perplexity and cache non-empty content"""
+    logger.info(f"Searching Perplexity for: {query}")
+    
+    response = await get_perplexity_client().post(
+        PERPLEXITY_API_URL,
+        headers=_perplexity_headers(api_key),
+        json={
+            "model": "sonar-pro",
+            "messages": [
+                {
+                    "role": "system", 
+                    "content": "You are a news research assistant. Find and structure the latest AI news into clear, factual summaries with proper citations."
+                },
+                {
+                    "role": "user", 
+                    "content": query
+                }
+            ],
+            "temperature": 0.2,
+            "max_tokens": 4000
+        }
+    )
+    
+    if response.status_code != 200:
+        logger.error(f"Perplexity API error: {response.status_code} - {response.text}")
+        return ""
+    
+    result = response.json()
+    content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+    
+    if not content:
+        logger.warning("Empty response from Perplexity API")
+        return ""
+    
+    _news_cache.set(cache_key, content, ttl=_NEWS_CACHE_TTL)
+    return content
+
+def _news_result(topic: str, query: str, content: str) -> List[Dict[str, Any]]:
+    """Wrap Perplexity content as the AI news tool result"""
+    # Return the raw content for now - the synthesis agent will structure it
+    return [{
+        "topic": topic,
+        "content": content,
+        "source_type": "perplexity",
+        "query_used": query,
+        "api_response": True
+    }]
+
 @perplexity_agent.tool
 async def search_perplexity_for_ai_news(
     ctx: RunContext[NewsResearchAgentDependencies],
@@ -75,52 +171,28 @@ async def search_perplexity_for_ai_news(
         else:
             query = f"{topic} latest AI news developments 2025"
         
-        logger.info(f"Searching Perplexity for: {query}")
+        cache_key = ResponseCache.make_key("sonar-pro", query)
+        content = _news_cache.get(cache_key)
+        if content is not None:
+            logger.info(f"Perplexity cache hit for: {query}")
+            return _news_result(topic, query, content)
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {ctx.deps.perplexity_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar-pro",
-                    "messages": [
-                        {
-                            "role": "system", 
-                            "content": "You are a news research assistant. Find and structure the latest AI news into clear, factual summaries with proper citations."
-                        },
-                        {
-                            "role": "user", 
-                            "content": query
-                        }
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 4000
-                }
+        # Concurrent identical misses share one in-flight request
+        request = _inflight.get(cache_key)
+        if request is None:
+            request = asyncio.ensure_future(
+                _fetch_ai_news(ctx.deps.perplexity_api_key, query, cache_key)
             )
-            
-            if response.status_code != 200:
-                logger.error(f"Perplexity API error: {response.status_code} - {response.text}")
-                return []
-            
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            
-            if not content:
-                logger.warning("Empty response from Perplexity API")
-                return []
-            
-            # Return the raw content for now - the synthesis agent will structure it
-            return [{
-                "topic": topic,
-                "content": content,
-                "source_type": "perplexity",
-                "query_used": query,
-                "api_response": True
-            }]
-            
+            _inflight[cache_key] = request
+            request.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+        
+        # Shielded so one cancelled caller does not cancel the shared request
+        content = await asyncio.shield(request)
+        if not content:
+            return []
+        
+        return _news_result(topic, query, content)
+        
     except httpx.TimeoutException:
         logger.error("Perplexity API request timed out")
         return []
@@ -131,6 +203,40 @@ async def search_perplexity_for_ai_news(
         logger.error(f"Unexpected error in Perplexity search: {str(e)}")
         return []
 
+async def _perplexity_web_research(api_key: str, query: str) -> Dict[str, Any]:
+    """Run a single Perplexity web research query"""
+    try:
+        logger.info(f"General Perplexity research for: {query}")
+        
+        response = await get_perplexity_client().post(
+            PERPLEXITY_API_URL,
+            headers=_perplexity_headers(api_key),
+            json={
+                "model": "sonar-pro", 
+                "messages": [{"role": "user", "content": query}],
+                "temperature": 0.1,
+                "max_tokens": 3000
+            }
+        )
+        
+        if response.status_code != 200:
+            return {"error": f"API error: {response.status_code}"}
+        
+        result = response.json()
+        content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+        
+        return {
+            "query": query,
+            "content": content,
+            "source": "perplexity_api",
+            "timestamp": "2025-01-08",  # Will be updated with actual timestamp
+            "success": True
+        }
+        
+    except Exception as e:
+        logger.error(f"General Perplexity research error: {str(e)}")
+        return {"error": str(e), "success": False}
+
 @perplexity_agent.tool  
 async def search_perplexity_web_research(
     ctx: RunContext[NewsResearchAgentDependencies],
@@ -145,38 +251,30 @@ async def search_perplexity_web_research(
     Returns:
         Dictionary with research results and metadata
     """
-    try:
-        logger.info(f"General Perplexity research for: {query}")
+    return await _perplexity_web_research(ctx.deps.perplexity_api_key, query)
+
+@perplexity_agent.tool
+async def search_perplexity_batch(
+    ctx: RunContext[NewsResearchAgentDependencies],
+    queries: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Run several independent Perplexity research queries concurrently.
+    
+    Args:
+        queries: Search queries for web research
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {ctx.deps.perplexity_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar-pro", 
-                    "messages": [{"role": "user", "content": query}],
-                    "temperature": 0.1,
-                    "max_tokens": 3000
-                }
-            )
-            
-            if response.status_code != 200:
-                return {"error": f"API error: {response.status_code}"}
-            
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            
-            return {
-                "query": query,
-                "content": content,
-                "source": "perplexity_api",
-                "timestamp": "2025-01-08",  # Will be updated with actual timestamp
-                "success": True
-            }
-            
-    except Exception as e:
-        logger.error(f"General Perplexity research error: {str(e)}")
-        return {"error": str(e), "success": False}
\ No newline at end of file
+    Returns:
+        One result dictionary per query, in the same order
+    """
+    results = await asyncio.gather(
+        *(_perplexity_web_research(ctx.deps.perplexity_api_key, query) for query in queries),
+        return_exceptions=True
+    )
+    
+    # A failed query reports its own error instead of failing the batch
+    return [
+        {"query": query, "error": str(result), "success": False}
+        if isinstance(result, BaseException) else result
+        for query, result in zip(queries, results)
+    ]
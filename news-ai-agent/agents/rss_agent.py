@@ -7,10 +7,16 @@ AI-related news content with intelligent filtering and summarization.
 
 import logging
 import asyncio
+import calendar
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 import feedparser
-from typing import Dict, Any, List
+import httpx
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic_ai import Agent, RunContext
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from clients import get_model
 from .deps import NewsResearchAgentDependencies
@@ -35,6 +41,7 @@ For each RSS feed, you should:
 - Assess relevance score (1-10) for AI community
 - Identify key topics and trends
 - Provide publication source credibility
+- Use extract_rss_articles_batch when several feeds need processing so they download concurrently
 
 Return structured data including:
 - Article title and cleaned summary
@@ -47,6 +54,106 @@ Return structured data including:
 Prioritize recent, high-quality content from credible sources.
 """
 
+# Basic AI/tech relevance keywords, matched as case-insensitive substrings
+AI_KEYWORDS = ["ai", "artificial intelligence", "machine learning", "ml", "deep learning", 
+               "neural network", "llm", "gpt", "chatgpt", "claude", "openai", "tech", "startup"]
+_AI_RE = re.compile("|".join(map(re.escape, AI_KEYWORDS)), re.IGNORECASE)
+
+# Shared client so feeds are fetched concurrently over pooled connections
+_RSS_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Worker processes so feedparser's pure-Python parsing is not serialized by the GIL
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+# Validators and last parse per feed URL for conditional GETs
+_feed_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def get_rss_client() -> httpx.AsyncClient:
+    """Get the shared RSS HTTP client, creating it on first use"""
+    global _RSS_CLIENT
+    if _RSS_CLIENT is None or _RSS_CLIENT.is_closed:
+        _RSS_CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            # Keep feedparser's User-Agent; some publishers reject httpx's default one
+            headers={"User-Agent": feedparser.USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32)
+        )
+    return _RSS_CLIENT
+
+
+async def close_rss_client() -> None:
+    """Close the shared RSS HTTP client and feed parsing pool"""
+    global _RSS_CLIENT, _PARSE_POOL
+    if _RSS_CLIENT is not None:
+        await _RSS_CLIENT.aclose()
+        _RSS_CLIENT = None
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(wait=False)
+        _PARSE_POOL = None
+
+
+async def _fetch_feed(feed_url: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """Download a feed, returning no body when the server reports it unchanged"""
+    request_headers = {}
+    cached = _feed_cache.get(feed_url)
+    if cached:
+        if cached["etag"]:
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+    
+    response = await get_rss_client().get(feed_url, headers=request_headers)
+    if response.status_code == 304 and cached:
+        return None, {}
+    response.raise_for_status()
+    
+    headers = {key.lower(): value for key, value in response.headers.items()}
+    # content-location lets feedparser resolve relative links against the feed URL
+    headers["content-location"] = str(response.url)
+    return response.content, headers
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get the shared feed parsing process pool, creating it on first use"""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 2))
+    return _PARSE_POOL
+
+
+def _parse_in_worker(data: bytes, headers: Dict[str, str]) -> Any:
+    """Parse feed bytes in a worker process"""
+    feed = feedparser.parse(data, response_headers=headers)
+    # Parser exceptions do not always survive pickling back to the parent
+    if "bozo_exception" in feed:
+        feed["bozo_exception"] = str(feed["bozo_exception"])
+    return feed
+
+
+async def _parse_feed(data: bytes, headers: Dict[str, str]) -> Any:
+    """Parse already-fetched feed bytes in the process pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_pool(), _parse_in_worker, data, headers)
+
+
+async def _load_feed(feed_url: str) -> Any:
+    """Fetch and parse a feed, reusing the last parse when it has not changed"""
+    data, headers = await _fetch_feed(feed_url)
+    if data is None:
+        return _feed_cache[feed_url]["feed"]
+    
+    feed = await _parse_feed(data, headers)
+    _feed_cache[feed_url] = {
+        "etag": headers.get("etag"),
+        "last_modified": headers.get("last-modified"),
+        "feed": feed
+    }
+    return feed
+
+
 # Initialize the RSS extraction agent
 rss_agent = Agent(
     get_model(use_smaller_model=False),
@@ -76,63 +183,95 @@ async def extract_rss_articles(
     try:
         logger.info(f"Extracting RSS articles from {feed_name}: {feed_url}")
         
-        # Use asyncio executor to run feedparser (blocking) in thread
-        loop = asyncio.get_event_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
-        
-        if not feed.entries:
-            logger.warning(f"No entries found in RSS feed: {feed_url}")
-            return []
-        
-        articles = []
-        cutoff_date = datetime.now() - timedelta(days=7)  # Last 7 days
-        
-        for entry in feed.entries[:max_articles]:
-            try:
-                # Parse publication date if available
-                published_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_date = datetime(*entry.updated_parsed[:6])
-                
-                # Skip articles older than 7 days
-                if published_date and published_date < cutoff_date:
-                    continue
-                
-                # Extract article data
-                article_data = {
-                    "title": getattr(entry, 'title', 'No Title'),
-                    "summary": getattr(entry, 'summary', getattr(entry, 'description', '')),
-                    "link": getattr(entry, 'link', ''),
-                    "published": getattr(entry, 'published', ''),
-                    "author": getattr(entry, 'author', ''),
-                    "source_name": feed_name,
-                    "source_url": feed_url,
-                    "source_type": "rss",
-                    "published_date": published_date.isoformat() if published_date else None
-                }
-                
-                # Basic AI/tech relevance filtering
-                title = article_data["title"].lower()
-                summary = article_data["summary"].lower()
-                ai_keywords = ["ai", "artificial intelligence", "machine learning", "ml", "deep learning", 
-                              "neural network", "llm", "gpt", "chatgpt", "claude", "openai", "tech", "startup"]
-                
-                if any(keyword in title or keyword in summary for keyword in ai_keywords):
-                    articles.append(article_data)
-                
-            except Exception as e:
-                logger.warning(f"Error processing RSS entry: {str(e)}")
-                continue
-        
-        logger.info(f"Extracted {len(articles)} relevant articles from {feed_name}")
-        return articles
+        feed = await _load_feed(feed_url)
+        return _extract_articles(feed, feed_url, feed_name, max_articles)
         
     except Exception as e:
         logger.error(f"RSS extraction error for {feed_url}: {str(e)}")
         return []
 
+@rss_agent.tool
+async def extract_rss_articles_batch(
+    ctx: RunContext[NewsResearchAgentDependencies],
+    feeds: List[Dict[str, str]],
+    max_articles: int = 10
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Extract articles from several RSS feeds at once, fetching them concurrently.
+    
+    Args:
+        feeds: Feeds to process, each with "feed_url" and "feed_name" keys
+        max_articles: Maximum number of articles to process per feed
+        
+    Returns:
+        Articles per feed name; feeds that fail to download or parse map to an empty list
+    """
+    logger.info(f"Extracting RSS articles from {len(feeds)} feeds")
+    
+    loaded = await asyncio.gather(
+        *(_load_feed(feed["feed_url"]) for feed in feeds),
+        return_exceptions=True
+    )
+    
+    results = {}
+    for feed, parsed_feed in zip(feeds, loaded):
+        feed_url, feed_name = feed["feed_url"], feed["feed_name"]
+        if isinstance(parsed_feed, BaseException):
+            logger.error(f"RSS extraction error for {feed_url}: {str(parsed_feed)}")
+            results[feed_name] = []
+            continue
+        
+        results[feed_name] = _extract_articles(parsed_feed, feed_url, feed_name, max_articles)
+    
+    return results
+
+def _extract_articles(feed: Any, feed_url: str, feed_name: str, max_articles: int) -> List[Dict[str, Any]]:
+    """Filter a parsed feed down to recent, AI-related articles"""
+    if not feed.entries:
+        logger.warning(f"No entries found in RSS feed: {feed_url}")
+        return []
+    
+    articles = []
+    cutoff_ts = time.time() - 7 * 86400  # Last 7 days
+    
+    for entry in feed.entries[:max_articles]:
+        try:
+            # feedparser entries are dicts, so one bound .get replaces getattr chains
+            get = entry.get
+            
+            # Basic AI/tech relevance filtering before any date work
+            title = get('title', 'No Title')
+            summary = get('summary', get('description', ''))
+            if not _AI_RE.search(title + "\n" + summary):
+                continue
+            
+            # feedparser's parsed dates are UTC struct_times; skip articles older than 7 days
+            published_parsed = get('published_parsed') or get('updated_parsed')
+            if published_parsed and calendar.timegm(published_parsed) < cutoff_ts:
+                continue
+            published_date = datetime(*published_parsed[:6]) if published_parsed else None
+            
+            # Extract article data
+            articles.append({
+                "title": title,
+                "summary": summary,
+                "link": get('link', ''),
+                "published": get('published', ''),
+                "author": get('author', ''),
+                "source_name": feed_name,
+                "source_url": feed_url,
+                "source_type": "rss",
+                "published_date": published_date.isoformat() if published_date else None
+            })
+            
+        except Exception as e:
+            logger.warning(f"Error processing RSS entry: {str(e)}")
+            continue
+    
+    logger.info(f"Extracted {len(articles)} relevant articles from {feed_name}")
+    return articles
+
+
 @rss_agent.tool
 async def analyze_rss_article_batch(
     ctx: RunContext[NewsResearchAgentDependencies],
@@ -207,8 +346,7 @@ async def get_feed_info(
         Feed metadata and information
     """
     try:
-        loop = asyncio.get_event_loop()
-        feed = await loop.run_in_executor(None, feedparser.parse, feed_url)
+        feed = await _load_feed(feed_url)
         
         return {
             "title": getattr(feed.feed, 'title', 'Unknown Feed'),
@@ -5,8 +5,9 @@ This agent synthesizes findings from all 3 parallel research agents (SEO, Social
 and creates a comprehensive email draft based on the combined research data.
 """
 
+import heapq
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from pydantic_ai import Agent, RunContext
 
 from clients import get_model
@@ -16,6 +17,11 @@ from .prompts import SYNTHESIS_SYSTEM_PROMPT, NEWS_SYNTHESIS_PROMPT
 logger = logging.getLogger(__name__)
 
 
+def _news_rank_key(item: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Rank news items by relevance score, then mention count"""
+    return (item.get('relevance_score', 0), item.get('mention_count', 0))
+
+
 # Initialize the synthesis agent
 synthesis_agent = Agent(
     get_model(use_smaller_model=False),
@@ -137,9 +143,8 @@ async def synthesize_ai_news(
         
         # Basic top news selection from database items (by relevance score)
         if all_news_items:
-            # Sort by relevance score and mention count
-            sorted_items = sorted(all_news_items, key=lambda x: (x.get('relevance_score', 0), x.get('mention_count', 0)), reverse=True)
-            top_items = sorted_items[:10]  # Top 10 items
+            # Top 10 items by relevance score and mention count, without a full sort
+            top_items = heapq.nlargest(10, all_news_items, key=_news_rank_key)
             
             synthesis_data["top_news_items"] = [
                 {
@@ -125,6 +125,11 @@ async def lifespan(app: FastAPI):
     # Shutdown: Clean up resources
     if http_client:
         await http_client.aclose()
+    
+    from agents.perplexity_agent import close_perplexity_client
+    from agents.rss_agent import close_rss_client
+    await close_perplexity_client()
+    await close_rss_client()
 
 
 # Initialize FastAPI app with lifespan
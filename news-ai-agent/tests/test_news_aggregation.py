@@ -387,7 +387,8 @@ class TestAPIIntegrationMocking:
         mock_deps = create_news_research_deps("test-session")
         mock_deps.perplexity_api_key = "test-key"
         
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch('httpx.AsyncClient') as mock_client, \
+             patch('agents.perplexity_agent._PPLX_CLIENT', None):
             # Mock successful API response
             mock_response = Mock()
             mock_response.status_code = 200
@@ -395,7 +396,7 @@ class TestAPIIntegrationMocking:
                 "choices": [{"message": {"content": "AI news research results"}}]
             }
             
-            mock_client.return_value.__aenter__.return_value.post.return_value = mock_response
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
             
             # Test the tool function
             result = await search_perplexity_for_ai_news(
@@ -407,6 +408,99 @@ class TestAPIIntegrationMocking:
             assert len(result) > 0
             assert result[0]["source_type"] == "perplexity"
     
+    @pytest.mark.asyncio
+    async def test_perplexity_response_cache(self):
+        """Test repeated Perplexity queries are served from the response cache"""
+        
+        from agents.perplexity_agent import search_perplexity_for_ai_news
+        from agents._cache import ResponseCache
+        from agents.deps import create_news_research_deps
+        
+        mock_deps = create_news_research_deps("test-session")
+        mock_deps.perplexity_api_key = "test-key"
+        
+        with patch('httpx.AsyncClient') as mock_client, \
+             patch('agents.perplexity_agent._PPLX_CLIENT', None), \
+             patch('agents.perplexity_agent._news_cache', ResponseCache()):
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "choices": [{"message": {"content": "Cached AI news"}}]
+            }
+            mock_post = AsyncMock(return_value=mock_response)
+            mock_client.return_value.post = mock_post
+            
+            first = await search_perplexity_for_ai_news(Mock(deps=mock_deps), topic="AI regulation")
+            second = await search_perplexity_for_ai_news(Mock(deps=mock_deps), topic="ai  REGULATION")
+            
+            assert first[0]["content"] == second[0]["content"] == "Cached AI news"
+            assert mock_post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_perplexity_single_flight(self):
+        """Test concurrent identical Perplexity queries share a single request"""
+        
+        from agents.perplexity_agent import search_perplexity_for_ai_news
+        from agents._cache import ResponseCache
+        from agents.deps import create_news_research_deps
+        
+        mock_deps = create_news_research_deps("test-session")
+        mock_deps.perplexity_api_key = "test-key"
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "Shared AI news"}}]
+        }
+        
+        async def slow_post(*args, **kwargs):
+            # Keep the first request in flight while the second call arrives
+            await asyncio.sleep(0.05)
+            return mock_response
+        
+        with patch('httpx.AsyncClient') as mock_client, \
+             patch('agents.perplexity_agent._PPLX_CLIENT', None), \
+             patch('agents.perplexity_agent._news_cache', ResponseCache()), \
+             patch('agents.perplexity_agent._inflight', {}):
+            mock_post = AsyncMock(side_effect=slow_post)
+            mock_client.return_value.post = mock_post
+            
+            first, second = await asyncio.gather(
+                search_perplexity_for_ai_news(Mock(deps=mock_deps), topic="AI chips"),
+                search_perplexity_for_ai_news(Mock(deps=mock_deps), topic="AI chips")
+            )
+            
+            assert first[0]["content"] == second[0]["content"] == "Shared AI news"
+            assert mock_post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_rss_not_modified_reuses_parsed_feed(self):
+        """Test a 304 revalidation returns the cached parse without re-parsing"""
+        
+        from agents.rss_agent import _load_feed
+        
+        feed_url = "https://example.com/feed.xml"
+        first_response = Mock()
+        first_response.status_code = 200
+        first_response.content = b"<rss></rss>"
+        first_response.headers = {"ETag": '"v1"'}
+        first_response.url = feed_url
+        not_modified = Mock()
+        not_modified.status_code = 304
+        
+        mock_client = Mock()
+        mock_client.get = AsyncMock(side_effect=[first_response, not_modified])
+        parsed_feed = {"entries": []}
+        
+        with patch('agents.rss_agent.get_rss_client', return_value=mock_client), \
+             patch('agents.rss_agent._parse_feed', AsyncMock(return_value=parsed_feed)) as mock_parse, \
+             patch('agents.rss_agent._feed_cache', {}):
+            assert await _load_feed(feed_url) is parsed_feed
+            assert await _load_feed(feed_url) is parsed_feed
+            
+            assert mock_parse.await_count == 1
+            assert mock_client.get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"v1"'
+    
     @pytest.mark.asyncio  
     async def test_supabase_client_mock(self):
         """Test Supabase client integration with mocking"""